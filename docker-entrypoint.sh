@@ -25,8 +25,24 @@ echo "📍 API 서버 시작 중..."
 uvicorn src.api.main:app --host 0.0.0.0 --port 8000 --reload &
 API_PID=$!
 
-# 잠시 대기
-sleep 5
+# API 서버 준비 대기 (고정 sleep 대신 /health를 지수 백오프로 폴링, 최대 30초)
+python - <<'EOF'
+import sys
+import time
+import urllib.request
+
+deadline = time.monotonic() + 30
+delay = 0.1
+while time.monotonic() < deadline:
+    try:
+        urllib.request.urlopen("http://localhost:8000/health", timeout=1)
+        break
+    except OSError:
+        time.sleep(delay)
+        delay = min(delay * 2, 2.0)
+else:
+    print("⚠️ API 서버가 30초 내에 응답하지 않았습니다", file=sys.stderr)
+EOF
 
 # Streamlit 서버 시작 (백그라운드)
 echo "🌐 Streamlit 서버 시작 중..."
@@ -6,13 +6,22 @@ AI 부트캠프 과제를 위한 완성된 웹 인터페이스
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import quote
 import json
+import ast
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import queue
+import atexit
 from datetime import datetime
 import time
+from importlib import import_module
+from importlib.util import find_spec
+from concurrent.futures import ThreadPoolExecutor, wait
 import sys
 import os
-from pathlib import Path
 from dotenv import load_dotenv
 
 # 페이지 설정 - 극한 성능 최적화 (반드시 다른 st 명령어보다 먼저 실행)
@@ -24,96 +33,287 @@ st.set_page_config(
     menu_items=None  # 메뉴 비활성화로 로딩 속도 향상
 )
 
-# plotly import를 안전하게 처리
-try:
-    import plotly.graph_objects as go
-    import plotly.express as px
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
+# plotly는 설치 여부만 확인하고 실제 import는 차트를 처음 그릴 때 수행
+PLOTLY_AVAILABLE = find_spec("plotly") is not None
+if not PLOTLY_AVAILABLE:
     st.warning("⚠️ plotly가 설치되지 않았습니다. 차트 기능이 제한됩니다.")
 
-import pandas as pd
 import numpy as np
 
-# 환경 변수 로딩
-load_dotenv()
+# orjson이 있으면 빠른 JSON 직렬화 사용 (없으면 표준 json으로 대체)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-# 로깅 설정 (UTF-8 인코딩으로 설정)
-import sys
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/streamlit_app.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# 로깅 설정 (UTF-8 인코딩, 파일/콘솔 출력은 백그라운드 스레드에서 처리)
+@st.cache_resource
+def setup_logging() -> QueueListener:
+    """로깅 설정 (프로세스당 한 번만 실행)
+
+    렌더링 스레드는 큐에 기록만 하고, QueueListener 스레드가 회전 로그 파일과 콘솔에 출력합니다.
+    """
+    os.makedirs('logs', exist_ok=True)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    file_handler = RotatingFileHandler(
+        'logs/streamlit_app.log',
+        maxBytes=5_000_000,
+        backupCount=3,
+        encoding='utf-8',
+        delay=True
+    )
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    # 종료 시 큐에 남은 로그를 모두 기록
+    atexit.register(listener.stop)
+    
+    logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+    return listener
+
+setup_logging()
 logger = logging.getLogger(__name__)
 
+# 환경 변수 로딩 및 API 설정 (스크립트 재실행 간 캐시)
+@st.cache_resource
+def load_api_settings():
+    """.env 로딩 후 API 설정값 반환
+
+    Streamlit은 상호작용마다 스크립트를 다시 실행하므로 .env 파일 읽기와
+    환경 변수 조회를 프로세스당 한 번만 수행합니다.
+    .env 또는 환경 변수를 런타임에 변경한 경우 load_api_settings.clear()로 캐시를 비워야 합니다.
+    """
+    load_dotenv()
+    return (
+        os.getenv("API_BASE_URL", "http://localhost:8000"),
+        int(os.getenv("API_TIMEOUT", "15")),  # 타임아웃 단축 (성능 개선)
+        int(os.getenv("CACHE_TTL", "300")),
+    )
+
 # API 설정
-API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
-API_TIMEOUT = int(os.getenv("API_TIMEOUT", "15"))  # 타임아웃 단축 (성능 개선)
-CACHE_TTL = int(os.getenv("CACHE_TTL", "300"))
+API_BASE_URL, API_TIMEOUT, CACHE_TTL = load_api_settings()
 
 # API 연결 재시도 설정 (최적화)
-API_RETRY_COUNT = 1  # 재시도 횟수 감소 (빠른 실패)
-API_RETRY_DELAY = 0.5  # 재시도 간격 단축
+API_RETRY_COUNT = 1  # 연결 실패/5xx 재시도 횟수 (빠른 실패)
+API_RETRY_DELAY = 0.5  # 재시도 백오프 계수
+API_HEALTH_SKIP_WINDOW = 30  # 마지막 성공 후 헬스 체크를 생략하는 시간(초)
+
+# 프로그레스 바 갱신 간격(초) - 갱신마다 브라우저로 delta가 전송되므로 과도한 갱신 방지
+PROGRESS_UPDATE_INTERVAL = 0.5
+STREAM_RENDER_INTERVAL = 0.1  # 스트리밍 답변 화면 갱신 간격(초)
+
+# 차트 설정 (브라우저로 전송되는 포인트 수 제한)
+CHART_MAX_POINTS = 1500
+CHAT_HISTORY_MAX = 50  # 세션에 보관할 최대 대화 수
+CHAT_HISTORY_DISPLAY = 10  # 화면에 표시할 최근 대화 수
+
+# 정적 안내 문구 (모듈 상수로 한 번만 생성)
+TROUBLESHOOTING_GUIDE = """
+### 🔧 문제 해결 방법
+1. **02_start_app.bat**를 다시 실행해보세요
+2. API 서버 창이 정상적으로 열렸는지 확인하세요
+3. 회사 Azure OpenAI 서비스 연결을 기다려주세요 (1-2분 소요)
+4. 포트 8000이 다른 프로그램에서 사용 중인지 확인하세요
+5. 방화벽 설정을 확인하세요
+
+### 🔍 Azure OpenAI 설정 확인
+AI 상담이 작동하지 않는 경우:
+1. .env 파일에서 다음 설정을 확인하세요:
+   - AOAI_ENDPOINT=https://your-resource.openai.azure.com/
+   - AOAI_API_KEY=your_azure_openai_api_key_here
+   - AOAI_DEPLOY_EMBED_3_SMALL=text-embedding-3-small
+2. Azure OpenAI Studio에서 임베딩 모델이 올바르게 배포되었는지 확인하세요
+3. 배포 이름이 .env 파일의 AOAI_DEPLOY_EMBED_3_SMALL과 일치하는지 확인하세요
+"""
+
+# AI 상담 실패 시 안내 문구
+QUERY_CONNECTION_HELP = """
+**가능한 원인:**
+1. API 서버가 실행되지 않음 (포트 8000)
+2. 네트워크 연결 문제
+3. 서버 타임아웃
+
+**해결 방법:**
+1. `02_start_app.bat` 실행하여 API 서버 시작
+2. 브라우저에서 `http://localhost:8000/health` 접속 확인
+3. 서버 로그 확인
+"""
+
+LOG_CHECK_GUIDE = """
+**서버 로그 확인 방법:**
+1. `logs/app.log` 파일 확인
+2. `logs/streamlit_app.log` 파일 확인
+3. 터미널에서 API 서버 로그 확인
+"""
+
+MANUAL_RUN_COMMANDS = """
+# API 서버 실행
+python -m uvicorn src.api.main:app --host 0.0.0.0 --port 8000 --reload
+
+# Streamlit 실행 (새 터미널에서)
+python -m streamlit run main.py --server.port 8501
+"""
+
+# 에이전트 유형별 표시 이름
+AGENT_NAMES = {
+    "budget": "💰 예산 관리",
+    "investment": "📈 투자 관리",
+    "tax": "🧾 세금 관리",
+    "retirement": "🎯 은퇴 계획",
+    "comprehensive": "🤖 종합 분석"
+}
+
+# 선택 상자 표시 이름
+RISK_TOLERANCE_LABELS = {"conservative": "보수적", "moderate": "중립적", "aggressive": "공격적"}
+ANALYSIS_TYPE_LABELS = {"sentiment": "감정 분석", "prediction": "시장 예측", "both": "감정 분석 + 시장 예측"}
+TAB_NAMES = ("💬 AI 상담", "📊 종합 분석", "📈 포트폴리오 시뮬레이션", "🎯 투자 분석")
 
-# 통합 API 호출 함수 (재시도 로직 포함)
-def make_api_request(method: str, endpoint: str, data: dict = None, timeout: int = None) -> dict:
-    """통합 API 호출 함수 (에러 처리 및 로깅 포함)"""
+# 샘플 질문 (버튼 레이블, 질문 내용)
+SAMPLE_QUESTIONS = (
+    ("💰 예산 관리 방법", "월급의 30%를 저축하려고 하는데, 어떤 방법으로 예산을 관리하면 좋을까요?"),
+    ("📈 투자 포트폴리오", "초보 투자자로서 안전하면서도 수익을 낼 수 있는 포트폴리오를 추천해주세요."),
+    ("🧾 세금 절약 전략", "연말정산에서 세금을 절약할 수 있는 방법들을 알려주세요."),
+    ("🎯 은퇴 계획", "30대 후반인데 은퇴를 위해 얼마나 저축해야 하고 어떤 준비를 해야 할까요?"),
+    ("🏠 부동산 투자", "부동산 투자를 고려하고 있는데, 현재 시점에서 어떤 지역이나 유형이 좋을까요?"),
+    ("💳 신용카드 관리", "신용카드를 효율적으로 사용하면서 신용점수를 관리하는 방법을 알려주세요."),
+)
+
+# HTTP 세션 (커넥션 풀 + keep-alive 재사용, 재시도는 urllib3 Retry에 위임)
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """커넥션 풀과 재시도 정책이 설정된 HTTP 세션 반환 (스크립트 재실행 간 공유)"""
+    session = requests.Session()
+    retry = Retry(
+        total=API_RETRY_COUNT,
+        read=0,  # 읽기 타임아웃은 재시도하지 않음 (빠른 실패)
+        backoff_factor=API_RETRY_DELAY,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Connection": "keep-alive",
+        "Accept": "application/json"
+    })
+    return session
+
+# API 서킷 브레이커 (최근 호출이 성공했다면 헬스 체크 요청 생략)
+class ApiCircuitBreaker:
+    """마지막 API 호출 성공 시각을 기록하여 불필요한 헬스 체크 요청을 줄이는 클래스"""
+    
+    def __init__(self, window: float):
+        self.window = window
+        self.last_success = None
+        self.last_connection_error = 0.0
+    
+    def record_success(self):
+        """API 호출 성공 기록"""
+        self.last_success = time.monotonic()
+    
+    def record_failure(self):
+        """API 호출 실패 기록 (다음 헬스 체크는 실제 요청 수행)"""
+        self.last_success = None
+    
+    def record_connection_error(self):
+        """API 서버 연결 실패 기록 (세션별 API 상태 재확인에 사용)"""
+        self.record_failure()
+        self.last_connection_error = time.monotonic()
+    
+    def recently_healthy(self) -> bool:
+        """최근 window초 이내에 성공한 호출이 있는지 확인"""
+        return self.last_success is not None and time.monotonic() - self.last_success < self.window
+
+@st.cache_resource
+def get_api_circuit_breaker() -> ApiCircuitBreaker:
+    """서킷 브레이커 반환 (스크립트 재실행 간 공유)"""
+    return ApiCircuitBreaker(API_HEALTH_SKIP_WINDOW)
+
+# JSON 직렬화/역직렬화 (bytes 기반)
+def json_dumps_bytes(data) -> bytes:
+    """요청 본문을 UTF-8 JSON bytes로 직렬화"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+def json_loads_bytes(content: bytes):
+    """응답 본문(bytes)을 디코딩 없이 바로 파싱"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+# 통합 API 호출 함수
+def make_api_request(method: str, endpoint: str, data: dict = None, timeout: int = None, params=None, not_found=None) -> dict:
+    """통합 API 호출 함수 (에러 처리 및 로깅 포함)
+
+    not_found를 지정하면 404/405 응답(엔드포인트 없음) 시 None 대신 그 값을 반환합니다.
+    """
     if timeout is None:
         timeout = API_TIMEOUT
     
     url = f"{API_BASE_URL}{endpoint}"
+    breaker = get_api_circuit_breaker()
     
-    for attempt in range(API_RETRY_COUNT):
-        try:
-            logger.info(f"API 요청 (시도 {attempt + 1}/{API_RETRY_COUNT}): {method} {url}")
-            start_time = time.time()
-            
-            if method.upper() == "GET":
-                response = requests.get(url, timeout=timeout)
-            elif method.upper() == "POST":
-                response = requests.post(url, json=data, timeout=timeout)
-            else:
-                raise ValueError(f"지원하지 않는 HTTP 메서드: {method}")
-            
-            elapsed_time = time.time() - start_time
-            logger.info(f"API 응답: {response.status_code} ({elapsed_time:.2f}초)")
+    try:
+        logger.debug("API 요청: %s %s", method, url)
+        start_time = time.time()
+        
+        if method.upper() == "GET":
+            response = get_http_session().get(url, params=params, timeout=timeout)
+        elif method.upper() == "POST":
+            response = get_http_session().post(
+                url,
+                data=json_dumps_bytes(data),
+                headers={"Content-Type": "application/json"},
+                timeout=timeout
+            )
+        else:
+            raise ValueError(f"지원하지 않는 HTTP 메서드: {method}")
+        
+        elapsed_time = time.time() - start_time
+        logger.info("API 응답: %s (%.2f초)", response.status_code, elapsed_time)
+        
+        if response.status_code == 200:
+            breaker.record_success()
+            return json_loads_bytes(response.content)
+        elif not_found is not None and response.status_code in (404, 405):
+            logger.warning("API 엔드포인트 없음: %s %s", method, url)
+            return not_found
+        else:
+            breaker.record_failure()
+            logger.error("API 오류: %s - %s", response.status_code, response.text)
+            return None
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"API 오류: {response.status_code} - {response.text}")
-                return None
-                
-        except requests.exceptions.Timeout:
-            logger.error(f"API 타임아웃 (시도 {attempt + 1}): {url}")
-            if attempt < API_RETRY_COUNT - 1:
-                time.sleep(API_RETRY_DELAY)
-                continue
-            return {"error": f"API 타임아웃 (시도 {attempt + 1}): {timeout}초 초과"}
-        except requests.exceptions.ConnectionError:
-            logger.error(f"API 연결 오류 (시도 {attempt + 1}): {url}")
-            if attempt < API_RETRY_COUNT - 1:
-                time.sleep(API_RETRY_DELAY)
-                continue
-            return {"error": f"API 서버 연결 실패 (시도 {attempt + 1}): 서버가 실행되지 않았거나 네트워크 문제"}
-        except Exception as e:
-            logger.error(f"API 요청 실패 (시도 {attempt + 1}): {e}")
-            if attempt < API_RETRY_COUNT - 1:
-                time.sleep(API_RETRY_DELAY)
-                continue
-            return {"error": f"API 요청 실패 (시도 {attempt + 1}): {str(e)}"}
-    
-    return None
+    except requests.exceptions.Timeout:
+        breaker.record_failure()
+        logger.error("API 타임아웃: %s", url)
+        return {"error": f"API 타임아웃: {timeout}초 초과"}
+    except requests.exceptions.ConnectionError:
+        breaker.record_connection_error()
+        logger.error("API 연결 오류: %s", url)
+        return {"error": "API 서버 연결 실패: 서버가 실행되지 않았거나 네트워크 문제"}
+    except Exception as e:
+        breaker.record_failure()
+        logger.error("API 요청 실패: %s", e)
+        return {"error": f"API 요청 실패: {str(e)}"}
 
-# 캐싱 설정 (최적화)
-@st.cache_data(ttl=5)  # 5초 캐시로 단축 (더 자주 확인)
 def check_api_health():
-    """API 서버 상태 확인"""
+    """API 서버 상태 확인 (최근 호출 성공 시 요청 생략)"""
+    if get_api_circuit_breaker().recently_healthy():
+        return True
+    return probe_api_health()
+
+# 헬스 체크 결과는 변경 불가능한 bool이므로 직렬화 없이 공유 (5초 캐시)
+@st.cache_resource(ttl=5, max_entries=1, show_spinner=False)
+def probe_api_health():
+    """API 서버 /health 엔드포인트 확인"""
     try:
         result = make_api_request("GET", "/health", timeout=3)  # 타임아웃 더 단축
         if result is None:
@@ -123,16 +323,228 @@ def check_api_health():
             return True
         return False
     except Exception as e:
-        logger.error(f"API 헬스 체크 실패: {e}")
+        logger.error("API 헬스 체크 실패: %s", e)
         return False
 
-@st.cache_data(ttl=10)  # 10초 캐시
-def call_api(endpoint, data=None):
-    """API 호출"""
-    if data:
-        return make_api_request("POST", endpoint, data)
+def refresh_api_health():
+    """API 상태 다시 확인 (다음 실행에서 헬스 체크 수행)"""
+    st.session_state.api_healthy = None
+    probe_api_health.clear()
+
+class ApiRequestFailed(Exception):
+    """GET 요청 실패 (실패 응답이 캐시되지 않도록 캐시 함수 밖으로 전달)"""
+    
+    def __init__(self, result):
+        super().__init__(result)
+        self.result = result
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _fetch_get_cached(endpoint, params=()):
+    """GET 요청 (성공한 응답만 캐시)"""
+    result = make_api_request("GET", endpoint, params=params or None)
+    if not result or "error" in result:
+        raise ApiRequestFailed(result)
+    return result
+
+def fetch_get(endpoint, params: dict = None):
+    """조회용 GET API 호출 (CACHE_TTL 동안 캐시, 쿼리 파라미터는 requests가 인코딩)"""
+    # 파라미터 순서와 관계없이 같은 캐시 키를 사용하도록 정렬된 튜플로 전달
+    cache_params = tuple(sorted(params.items())) if params else ()
+    try:
+        return _fetch_get_cached(endpoint, cache_params)
+    except ApiRequestFailed as e:
+        return e.result
+
+def post_api(endpoint, data):
+    """분석용 POST API 호출 (요청마다 결과가 달라지므로 캐시하지 않음)"""
+    return make_api_request("POST", endpoint, data)
+
+# /ai/analyze가 없는 이전 서버 판별용 표식
+_ENDPOINT_MISSING = object()
+
+def analyze_symbol(symbol, kinds, days=30, confidence_level=0.8):
+    """종목 분석 (감정 분석/시장 예측을 /ai/analyze 한 번의 요청으로 처리)
+
+    /ai/analyze가 없는 이전 서버(404/405)에서만 기존 개별 엔드포인트를 동시에 호출합니다.
+    스크립트 스레드에서만 호출해야 합니다 (스레드 풀 작업 안에서 호출하면 대기 중 교착 가능).
+    """
+    result = make_api_request("POST", "/ai/analyze", {
+        "symbol": symbol,
+        "kinds": kinds,
+        "days": days,
+        "confidence_level": confidence_level
+    }, not_found=_ENDPOINT_MISSING)
+    if result is not _ENDPOINT_MISSING:
+        # 서버 오류/타임아웃은 개별 엔드포인트로 다시 시도하지 않고 항목별 오류로 반환
+        if result is None or ("error" in result and not any(kind in result for kind in kinds)):
+            error = (result or {}).get("error", "분석 요청이 실패했습니다.")
+            return {"symbol": symbol, **{kind: {"error": error} for kind in kinds}}
+        return result
+    
+    # 이전 API 서버 호환 (개별 엔드포인트를 스레드 풀에서 동시에 호출)
+    executor = get_api_executor()
+    futures = {}
+    if "sentiment" in kinds:
+        futures["sentiment"] = executor.submit(
+            post_api, "/ai/sentiment-analysis", {"text_data": [f"분석 대상: {symbol}"]}
+        )
+    if "prediction" in kinds:
+        futures["prediction"] = executor.submit(
+            fetch_get,
+            f"/ai/market-prediction/{quote(symbol, safe='')}",
+            {"days": days, "confidence_level": confidence_level}
+        )
+    
+    result = {"symbol": symbol}
+    for kind, future in futures.items():
+        result[kind] = future.result()
+    return result
+
+def stream_query(query, user_data, placeholder, status_text=None):
+    """/query/stream 응답을 받는 대로 placeholder에 표시하고 /query와 같은 형식의 응답 반환
+
+    status_text가 있으면 지금까지 받은 글자 수를 함께 표시합니다.
+    스트리밍 엔드포인트가 없거나(404/405) 연결할 수 없을 때만 None을 반환합니다 (기존 /query 호출로 대체).
+    그 밖의 실패(타임아웃, 서버 오류, 스트리밍 중단)는 같은 작업을 다시 요청하지 않도록 {"error": ...}를 반환합니다.
+    """
+    url = f"{API_BASE_URL}/query/stream"
+    breaker = get_api_circuit_breaker()
+    
+    try:
+        logger.debug("API 스트리밍 요청: POST %s", url)
+        response = get_http_session().post(
+            url,
+            data=json_dumps_bytes({"query": query, "user_data": user_data}),
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "text/event-stream",
+                "Accept-Encoding": "identity"  # gzip 압축 시 이벤트가 버퍼링되므로 비활성화
+            },
+            stream=True,
+            timeout=API_TIMEOUT
+        )
+    except requests.exceptions.ConnectionError as e:
+        logger.error("API 스트리밍 연결 실패: %s", e)
+        return None
+    except requests.exceptions.RequestException as e:
+        logger.error("API 스트리밍 요청 실패: %s", e)
+        return {"error": f"스트리밍 요청 실패: {e}"}
+    
+    with response:
+        if response.status_code in (404, 405):
+            logger.warning("API 스트리밍 미지원: %s", response.status_code)
+            return None
+        if response.status_code != 200:
+            logger.warning("API 스트리밍 오류: %s", response.status_code)
+            return {"error": f"스트리밍 응답 오류 (HTTP {response.status_code})"}
+        breaker.record_success()
+        
+        parts = []
+        received = 0
+        result = {"query": query}
+        last_render = 0.0
+        try:
+            for line in response.iter_lines():
+                if not line.startswith(b"data: "):
+                    continue
+                event = json_loads_bytes(line[6:])
+                if "delta" not in event:
+                    # 마지막 이벤트 (agent_type, context_used 또는 error)
+                    result.update(event)
+                    continue
+                parts.append(event["delta"])
+                received += len(event["delta"])
+                now = time.monotonic()
+                if now - last_render >= STREAM_RENDER_INTERVAL:
+                    placeholder.markdown(_format_ai_markdown("".join(parts)) + " ▌")
+                    if status_text is not None:
+                        status_text.text(f"🔄 답변 수신 중... ({received:,}자)")
+                    last_render = now
+        except requests.exceptions.RequestException as e:
+            logger.error("API 스트리밍 중단: %s", e)
+            return {"error": f"스트리밍 응답이 중단되었습니다: {e}"}
+    
+    if "error" in result:
+        return {"error": result["error"]}
+    if not parts:
+        return {"error": "답변을 생성할 수 없습니다."}
+    result["answer"] = "".join(parts)
+    return result
+
+# 백그라운드 API 호출용 스레드 풀
+@st.cache_resource
+def get_api_executor() -> ThreadPoolExecutor:
+    """백그라운드 API 호출용 스레드 풀 반환 (스크립트 재실행 간 공유)"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="api")
+
+def run_api_with_progress(endpoint, data, progress_bar, status_text, steps, start=0.1):
+    """API 호출을 백그라운드 스레드에서 실행하고, 응답 대기 중에 프로그레스 바를 진행
+
+    data가 None이면 조회용 GET(fetch_get), 그렇지 않으면 POST(post_api)로 호출합니다.
+    """
+    if data is None:
+        future = get_api_executor().submit(fetch_get, endpoint)
     else:
-        return make_api_request("GET", endpoint)
+        future = get_api_executor().submit(post_api, endpoint, data)
+    return wait_with_progress(future, progress_bar, status_text, steps, start)
+
+def wait_with_progress(future, progress_bar, status_text, steps, start=0.1):
+    """백그라운드 작업(future)이 끝날 때까지 프로그레스 바를 진행하고 결과 반환"""
+    progress = start
+    step_index = 0
+    # 응답이 오면 즉시 반환되고, 대기 중에는 PROGRESS_UPDATE_INTERVAL마다 한 번만 UI 갱신
+    while not wait([future], timeout=PROGRESS_UPDATE_INTERVAL).done:
+        # 응답 전까지 0.9를 넘지 않도록 점근적으로 증가
+        progress += (0.9 - progress) * 0.2
+        progress_bar.progress(progress)
+        
+        # 진행률에 맞춰 단계 메시지 갱신 (마지막 '완료' 단계 제외)
+        current_index = min(int(progress / 0.9 * (len(steps) - 1)), len(steps) - 2)
+        if current_index != step_index:
+            step_index = current_index
+            status_text.text(steps[step_index])
+    
+    return future.result()
+
+# 답변 추출 (서버가 dict를 풀어서 반환하므로 이전 형식 문자열만 한 번 파싱)
+_ANSWER_REPR_PREFIX = "{'answer'"
+_ANSWER_DICT_PREFIXES = (_ANSWER_REPR_PREFIX, '{"answer"')
+
+def _unwrap_answer(answer) -> str:
+    """API 응답의 answer 값에서 실제 답변 문자열 추출"""
+    if isinstance(answer, dict):
+        return str(answer.get("answer", answer))
+    if not isinstance(answer, str):
+        return str(answer)
+    if not answer.startswith(_ANSWER_DICT_PREFIXES):
+        return answer
+    
+    try:
+        if answer.startswith(_ANSWER_REPR_PREFIX):
+            # 파이썬 dict repr 형식은 json 파서로 읽을 수 없으므로 리터럴로 해석
+            parsed = ast.literal_eval(answer)
+        else:
+            parsed = json_loads_bytes(answer)
+    except (ValueError, SyntaxError):  # orjson.JSONDecodeError도 ValueError 하위 클래스
+        # 파싱 실패 시 원본 사용
+        return answer
+    if isinstance(parsed, dict) and "answer" in parsed:
+        return str(parsed["answer"])
+    return answer
+
+# AI 답변 포맷팅 (마크다운 파싱은 st.markdown에 위임)
+def _format_ai_markdown(text: str) -> str:
+    """AI 답변 텍스트를 st.markdown으로 바로 렌더링할 수 있는 마크다운으로 정리"""
+    # 이스케이프된 \n을 실제 줄바꿈으로 변환 (공백뿐인 답변은 빈 문자열로 만들어 렌더링 생략)
+    return text.replace("\\n", "\n").strip()
+
+# plotly 지연 로딩
+@st.cache_resource(show_spinner=False)
+def load_plotly():
+    """plotly 모듈 (graph_objects, express) 반환 (첫 차트 생성 시 한 번만 import)"""
+    import plotly.graph_objects as go
+    import plotly.express as px
+    return go, px
 
 # 실시간 데이터 관련 함수들
 def create_market_dashboard():
@@ -151,18 +563,29 @@ def create_portfolio_chart(portfolio_data):
         return None
     
     try:
+        go, _ = load_plotly()
+        
         # 포트폴리오 성과 차트
         fig = go.Figure()
         
         # 수익률 라인 차트
         if "portfolio_returns" in portfolio_data:
-            returns = portfolio_data["portfolio_returns"]
-            dates = pd.date_range(start=portfolio_data.get("start_date", "2023-01-01"), 
-                                periods=len(returns), freq='D')
+            # 리스트/Series 모두 처리 가능하도록 float 배열로 변환 후 누적 수익률(%) 계산
+            returns = np.asarray(portfolio_data["portfolio_returns"], dtype=np.float64)
+            cumulative = np.cumsum(returns) * 100
+            # 일 단위 날짜 배열 (DatetimeIndex 대신 datetime64 배열로 직렬화 비용 감소)
+            start_day = np.datetime64(portfolio_data.get("start_date", "2023-01-01"), 'D')
+            dates = start_day + np.arange(len(returns), dtype='timedelta64[D]')
+            
+            # 포인트가 많으면 균등 간격으로 다운샘플링 (마지막 포인트는 항상 포함)
+            if len(cumulative) > CHART_MAX_POINTS:
+                idx = np.unique(np.linspace(0, len(cumulative) - 1, CHART_MAX_POINTS).astype(np.int64))
+                dates = dates[idx]
+                cumulative = cumulative[idx]
             
-            fig.add_trace(go.Scatter(
+            fig.add_trace(go.Scattergl(
                 x=dates,
-                y=returns.cumsum() * 100,  # 누적 수익률을 퍼센트로
+                y=cumulative,  # 누적 수익률을 퍼센트로
                 mode='lines',
                 name='포트폴리오 수익률',
                 line=dict(color='#1f77b4', width=2)
@@ -181,6 +604,35 @@ def create_portfolio_chart(portfolio_data):
         logger.error(f"포트폴리오 차트 생성 실패: {e}")
         return None
 
+@st.cache_resource(max_entries=64, show_spinner=False)
+def create_sentiment_gauge(score_bucket):
+    """감정 지수 게이지 차트 생성 (소수 둘째 자리 점수별로 Figure 재사용)"""
+    go, _ = load_plotly()
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=score_bucket,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "시장 감정 지수"},
+        delta={'reference': 0},
+        gauge={
+            'axis': {'range': [-1, 1]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [-1, -0.3], 'color': "lightgray"},
+                {'range': [-0.3, 0.3], 'color': "yellow"},
+                {'range': [0.3, 1], 'color': "lightgreen"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 0.8
+            }
+        }
+    ))
+
+    fig.update_layout(height=400)
+    return fig
+
 def create_expense_pie_chart(expenses_data):
     """지출 파이 차트 생성"""
     if not PLOTLY_AVAILABLE:
@@ -191,6 +643,8 @@ def create_expense_pie_chart(expenses_data):
         return None
     
     try:
+        _, px = load_plotly()
+        
         # 카테고리별 지출 데이터
         categories = list(expenses_data.keys())
         amounts = list(expenses_data.values())
@@ -214,65 +668,98 @@ def format_currency(amount):
     """통화 포맷팅"""
     return f"₩{amount:,.0f}"
 
-# 세션 상태 초기화 (한 번만 실행)
-if 'chat_history' not in st.session_state:
-    st.session_state.chat_history = []
-if 'user_query' not in st.session_state:
+def init_session_state():
+    """세션 상태 초기화 (스크립트 실행 시에만 호출, import 시에는 실행되지 않음)"""
+    # 기본값은 호출마다 새로 생성 (세션 간 리스트 공유 방지)
+    defaults = {
+        'chat_history': [],
+        'user_query': "",
+        'api_healthy': None,
+        'api_checked_at': 0.0,
+        'app_start_time': time.time(),
+        'auto_submit': False,
+        'is_loading': False,
+        'analysis_type': None,
+        'show_detailed': False,
+        'show_summary': False,
+        'quick_analysis': None,
+        'show_question_input': False,
+    }
+    for key, value in defaults.items():
+        st.session_state.setdefault(key, value)
+
+def append_chat_history(entry: dict):
+    """대화 기록 추가 (최근 CHAT_HISTORY_MAX개만 보관)"""
+    history = st.session_state.chat_history
+    history.append(entry)
+    if len(history) > CHAT_HISTORY_MAX:
+        del history[:-CHAT_HISTORY_MAX]
+
+def select_sample_question(query: str):
+    """샘플 질문 선택 (버튼 콜백: 입력창에 질문을 넣고 이번 실행에서 바로 처리)"""
+    st.session_state.user_query = query
+    st.session_state.show_question_input = True
+    st.session_state.ai_consultation_auto_submit = True
+
+def clear_user_query():
+    """질문 입력 초기화 (버튼 콜백)"""
     st.session_state.user_query = ""
-if 'api_checked' not in st.session_state:
-    st.session_state.api_checked = False
-if 'app_start_time' not in st.session_state:
-    st.session_state.app_start_time = time.time()
-if 'auto_submit' not in st.session_state:
-    st.session_state.auto_submit = False
-if 'is_loading' not in st.session_state:
-    st.session_state.is_loading = False
-if 'analysis_type' not in st.session_state:
-    st.session_state.analysis_type = None
-if 'show_detailed' not in st.session_state:
-    st.session_state.show_detailed = False
-if 'show_summary' not in st.session_state:
-    st.session_state.show_summary = False
-
-if 'quick_analysis' not in st.session_state:
-    st.session_state.quick_analysis = None
-if 'show_question_input' not in st.session_state:
     st.session_state.show_question_input = False
 
+def render_ai_answer(user_query, raw_answer, agent_type, context_used, elapsed_time):
+    """AI 답변 표시 및 대화 기록 저장 (agent_type이 없으면 답변 제공 에이전트 표시 생략)"""
+    # 답변 내용 추출 (딕셔너리 형태의 문자열인 경우 실제 내용만 추출)
+    answer_text = _unwrap_answer(raw_answer)
+    
+    # 마크다운 정리는 한 번만 수행하고 히스토리에 함께 저장
+    formatted_answer = _format_ai_markdown(answer_text) if answer_text else ""
+    
+    # 채팅 히스토리에 추가
+    append_chat_history({
+        "user": user_query,
+        "ai": answer_text,
+        "ai_markdown": formatted_answer,
+        "timestamp": datetime.now().strftime("%H:%M"),
+        "agent_type": agent_type or "unknown"
+    })
+    
+    # 답변 표시
+    st.success(f"✅ 답변 완료! (소요시간: {elapsed_time:.2f}초)")
+    # 구분선, 제목, 답변을 하나의 마크다운 요소로 묶어 렌더링 요소 수를 줄임
+    st.markdown(
+        "---\n### 🤖 AI 답변\n\n"
+        + (formatted_answer or "답변을 생성할 수 없습니다.")
+    )
+    
+    # 에이전트 정보 표시
+    if agent_type:
+        st.info(f"답변 제공: {AGENT_NAMES.get(agent_type, 'AI 어드바이저')}")
+    
+    # 컨텍스트 사용 여부
+    if context_used:
+        st.info("📚 지식베이스의 관련 정보를 참조했습니다.")
+    
+    # 입력 필드 초기화 (다음 실행에서 적용)
+    st.session_state.clear_user_query = True
+
 def render_ai_consultation_tab():
     """AI 상담 탭"""
     st.header("💬 AI 상담")
     
     # 샘플 질문 버튼들
     st.subheader("📝 샘플 질문")
-    col1, col2, col3 = st.columns(3)
+    sample_cols = st.columns(3)
     
-    with col1:
-        if st.button("💰 예산 관리 방법", use_container_width=True, disabled=st.session_state.is_loading):
-            st.session_state.user_query = "월급의 30%를 저축하려고 하는데, 어떤 방법으로 예산을 관리하면 좋을까요?"
-            st.session_state.ai_consultation_auto_submit = True
-        
-        if st.button("📈 투자 포트폴리오", use_container_width=True, disabled=st.session_state.is_loading):
-            st.session_state.user_query = "초보 투자자로서 안전하면서도 수익을 낼 수 있는 포트폴리오를 추천해주세요."
-            st.session_state.ai_consultation_auto_submit = True
-    
-    with col2:
-        if st.button("🧾 세금 절약 전략", use_container_width=True, disabled=st.session_state.is_loading):
-            st.session_state.user_query = "연말정산에서 세금을 절약할 수 있는 방법들을 알려주세요."
-            st.session_state.ai_consultation_auto_submit = True
-        
-        if st.button("🎯 은퇴 계획", use_container_width=True, disabled=st.session_state.is_loading):
-            st.session_state.user_query = "30대 후반인데 은퇴를 위해 얼마나 저축해야 하고 어떤 준비를 해야 할까요?"
-            st.session_state.ai_consultation_auto_submit = True
-    
-    with col3:
-        if st.button("🏠 부동산 투자", use_container_width=True, disabled=st.session_state.is_loading):
-            st.session_state.user_query = "부동산 투자를 고려하고 있는데, 현재 시점에서 어떤 지역이나 유형이 좋을까요?"
-            st.session_state.ai_consultation_auto_submit = True
-        
-        if st.button("💳 신용카드 관리", use_container_width=True, disabled=st.session_state.is_loading):
-            st.session_state.user_query = "신용카드를 효율적으로 사용하면서 신용점수를 관리하는 방법을 알려주세요."
-            st.session_state.ai_consultation_auto_submit = True
+    # 컬럼당 2개씩 순서대로 배치
+    for i, (label, query) in enumerate(SAMPLE_QUESTIONS):
+        with sample_cols[i // 2]:
+            st.button(
+                label,
+                use_container_width=True,
+                disabled=st.session_state.is_loading,
+                on_click=select_sample_question,
+                args=(query,)
+            )
     
     # 샘플 질문 아래 간단한 질문하기 버튼
     st.markdown("---")
@@ -285,10 +772,14 @@ def render_ai_consultation_tab():
     submit_button = False
     user_query = ""
     
+    # 이전 답변 완료 후 입력창 비우기 (위젯 생성 전에만 값 변경 가능)
+    if st.session_state.pop('clear_user_query', False):
+        st.session_state.user_query = ""
+    
     if st.session_state.get('show_question_input', False):
         user_query = st.text_area(
             "재무 관련 질문을 입력하세요:",
-            value=st.session_state.user_query,
+            key="user_query",
             height=100,
             placeholder="예: 월급의 30%를 저축하려고 하는데, 어떤 방법으로 예산을 관리하면 좋을까요?"
         )
@@ -298,9 +789,7 @@ def render_ai_consultation_tab():
             submit_button = st.button("🤖 AI에게 질문하기", type="primary", disabled=st.session_state.is_loading)
         
         with col2:
-            if st.button("🗑️ 입력 초기화", type="secondary", disabled=st.session_state.is_loading):
-                st.session_state.user_query = ""
-                st.session_state.show_question_input = False
+            st.button("🗑️ 입력 초기화", type="secondary", disabled=st.session_state.is_loading, on_click=clear_user_query)
     
     # 질문 처리
     if submit_button or st.session_state.get('ai_consultation_auto_submit', False):
@@ -327,23 +816,23 @@ def render_ai_consultation_tab():
                 "✅ 완료!"
             ]
             
-            # 첫 번째 단계 표시
             progress_bar.progress(0.2)
-            status_text.text(steps[0])
             
-            # API 호출 (실제 처리)
-            response = call_api("/query", {"query": user_query, "user_data": None})
+            # 스트리밍 응답 우선 (생성되는 답변을 바로 표시, 완료 후 아래에서 다시 정리해 표시)
+            status_text.text(steps[3])
+            stream_area = st.empty()
+            response = stream_query(user_query, None, stream_area, status_text)
+            stream_area.empty()
+            
+            # 스트리밍 미지원 시 API 호출 (백그라운드 스레드에서 실행, 대기 중 진행 상황 표시)
+            if response is None:
+                response = run_api_with_progress(
+                    "/query", {"query": user_query, "user_data": None},
+                    progress_bar, status_text, steps, start=0.2
+                )
             
-            # API 호출 완료 후 나머지 단계 표시
+            # API 호출 완료 후 최종 단계 표시
             if response:
-                progress_bar.progress(0.6)
-                status_text.text(steps[2])
-                time.sleep(0.3)
-                
-                progress_bar.progress(0.8)
-                status_text.text(steps[3])
-                time.sleep(0.2)
-                
                 progress_bar.progress(1.0)
                 status_text.text(steps[4])
             else:
@@ -357,164 +846,13 @@ def render_ai_consultation_tab():
             st.session_state.is_loading = False
             
             if response and "answer" in response:
-                # 답변 내용 추출
-                answer_text = response["answer"]
-                
-                # 문자열이 아닌 경우 문자열로 변환
-                if not isinstance(answer_text, str):
-                    answer_text = str(answer_text)
-                
-                # 딕셔너리 형태의 문자열인 경우 실제 내용만 추출
-                if answer_text.startswith("{'answer': '") or answer_text.startswith('{"answer": "'):
-                    # JSON 형태의 문자열에서 실제 답변만 추출
-                    try:
-                        import json
-                        import ast
-                        # 먼저 ast.literal_eval로 파싱 시도
-                        try:
-                            parsed = ast.literal_eval(answer_text)
-                            if isinstance(parsed, dict) and "answer" in parsed:
-                                answer_text = parsed["answer"]
-                        except:
-                            # JSON 파싱 시도
-                            try:
-                                parsed = json.loads(answer_text)
-                                if isinstance(parsed, dict) and "answer" in parsed:
-                                    answer_text = parsed["answer"]
-                            except:
-                                # 파싱 실패 시 원본 사용
-                                pass
-                    except:
-                        pass
-                
-
-                # 채팅 히스토리에 추가
-                st.session_state.chat_history.append({
-                    "user": user_query,
-                    "ai": answer_text,
-                    "timestamp": datetime.now().strftime("%H:%M"),
-                    "agent_type": response.get("agent_type", "unknown")
-                })
-                
-                # 답변 표시
-                st.success(f"✅ 답변 완료! (소요시간: {elapsed_time:.2f}초)")
-                
-                # 답변 내용 표시
-                st.markdown("---")
-                st.markdown("### 🤖 AI 답변")
-                
-                # 줄바꿈과 HTML 태그 처리
-                if answer_text:
-                    # 이스케이프된 \n을 실제 줄바꿈으로 변환
-                    formatted_answer = answer_text.replace("\\n", "\n")
-                    
-                    # 마크다운 형식으로 변환
-                    # ### 제목 형식을 HTML로 변환
-                    formatted_answer = formatted_answer.replace("### ", "<h3>").replace("\n", "</h3>\n")
-                    
-                    # 번호가 있는 목록 처리
-                    import re
-                    formatted_answer = re.sub(r'(\d+)\.\s+', r'<strong>\1.</strong> ', formatted_answer)
-                    
-                    # 줄바꿈을 HTML로 변환
-                    formatted_answer = formatted_answer.replace("\n\n", "</p><p>")
-                    formatted_answer = formatted_answer.replace("\n", "<br>")
-                    
-                    # HTML 태그로 감싸기
-                    formatted_answer = f"<p>{formatted_answer}</p>"
-                    
-                    st.markdown(formatted_answer, unsafe_allow_html=True)
-                else:
-                    st.write("답변을 생성할 수 없습니다.")
-                
-                # 에이전트 정보 표시
-                if "agent_type" in response:
-                    agent_names = {
-                        "budget": "💰 예산 관리",
-                        "investment": "📈 투자 관리",
-                        "tax": "🧾 세금 관리",
-                        "retirement": "🎯 은퇴 계획",
-                        "comprehensive": "🤖 종합 분석"
-                    }
-                    agent_name = agent_names.get(response["agent_type"], "AI 어드바이저")
-                    st.info(f"답변 제공: {agent_name}")
-                
-                # 컨텍스트 사용 여부
-                if response.get("context_used"):
-                    st.info("📚 지식베이스의 관련 정보를 참조했습니다.")
-                
-                # 입력 필드 초기화
-                st.session_state.user_query = ""
-                
+                render_ai_answer(
+                    user_query, response["answer"], response.get("agent_type"),
+                    response.get("context_used", False), elapsed_time
+                )
             elif response and "response" in response:
-                # 답변 내용 추출
-                response_text = response["response"]
-                
-                # 문자열이 아닌 경우 문자열로 변환
-                if not isinstance(response_text, str):
-                    response_text = str(response_text)
-                
-                # 딕셔너리 형태의 문자열인 경우 실제 내용만 추출
-                if response_text.startswith("{'answer': '") or response_text.startswith('{"answer": "'):
-                    # JSON 형태의 문자열에서 실제 답변만 추출
-                    try:
-                        import json
-                        import ast
-                        # 먼저 ast.literal_eval로 파싱 시도
-                        try:
-                            parsed = ast.literal_eval(response_text)
-                            if isinstance(parsed, dict) and "answer" in parsed:
-                                response_text = parsed["answer"]
-                        except:
-                            # JSON 파싱 시도
-                            try:
-                                parsed = json.loads(response_text)
-                                if isinstance(parsed, dict) and "answer" in parsed:
-                                    response_text = parsed["answer"]
-                            except:
-                                # 파싱 실패 시 원본 사용
-                                pass
-                    except:
-                        pass
-                
                 # 이전 API 응답 형식 지원
-                st.session_state.chat_history.append({
-                    "user": user_query,
-                    "ai": response_text,
-                    "timestamp": datetime.now().strftime("%H:%M"),
-                    "agent_type": "comprehensive"
-                })
-                
-                st.success(f"✅ 답변 완료! (소요시간: {elapsed_time:.2f}초)")
-                st.markdown("---")
-                st.markdown("### 🤖 AI 답변")
-                
-                # 줄바꿈과 HTML 태그 처리
-                if response_text:
-                    # 이스케이프된 \n을 실제 줄바꿈으로 변환
-                    formatted_response = response_text.replace("\\n", "\n")
-                    
-                    # 마크다운 형식으로 변환
-                    # ### 제목 형식을 HTML로 변환
-                    formatted_response = formatted_response.replace("### ", "<h3>").replace("\n", "</h3>\n")
-                    
-                    # 번호가 있는 목록 처리
-                    import re
-                    formatted_response = re.sub(r'(\d+)\.\s+', r'<strong>\1.</strong> ', formatted_response)
-                    
-                    # 줄바꿈을 HTML로 변환
-                    formatted_response = formatted_response.replace("\n\n", "</p><p>")
-                    formatted_response = formatted_response.replace("\n", "<br>")
-                    
-                    # HTML 태그로 감싸기
-                    formatted_response = f"<p>{formatted_response}</p>"
-                    
-                    st.markdown(formatted_response, unsafe_allow_html=True)
-                else:
-                    st.write("답변을 생성할 수 없습니다.")
-                st.info("답변 제공: 🤖 종합 분석")
-                st.session_state.user_query = ""
-                
+                render_ai_answer(user_query, response["response"], "comprehensive", False, elapsed_time)
             else:
                 st.error("❌ 답변을 생성할 수 없습니다.")
                 
@@ -524,17 +862,7 @@ def render_ai_consultation_tab():
                 
                 if response is None:
                     st.error("**API 서버 연결 실패**")
-                    st.write("""
-                    **가능한 원인:**
-                    1. API 서버가 실행되지 않음 (포트 8000)
-                    2. 네트워크 연결 문제
-                    3. 서버 타임아웃
-                    
-                    **해결 방법:**
-                    1. `02_start_app.bat` 실행하여 API 서버 시작
-                    2. 브라우저에서 `http://localhost:8000/health` 접속 확인
-                    3. 서버 로그 확인
-                    """)
+                    st.markdown(QUERY_CONNECTION_HELP)
                 elif isinstance(response, dict):
                     if "error" in response:
                         st.error(f"**API 오류:** {response['error']}")
@@ -554,12 +882,7 @@ def render_ai_consultation_tab():
                 
                 # 로그 파일 확인 안내
                 st.markdown("### 📋 로그 확인")
-                st.info("""
-                **서버 로그 확인 방법:**
-                1. `logs/app.log` 파일 확인
-                2. `logs/streamlit_app.log` 파일 확인
-                3. 터미널에서 API 서버 로그 확인
-                """)
+                st.info(LOG_CHECK_GUIDE)
         else:
             st.warning("⚠️ 질문을 입력해주세요.")
     
@@ -578,45 +901,25 @@ def render_ai_consultation_tab():
         with col2:
             st.caption(f"총 {len(st.session_state.chat_history)}개의 대화 기록")
         
-        # 최신 대화부터 표시
-        for i, chat in enumerate(reversed(st.session_state.chat_history[-10:])):  # 최근 10개만 표시
+        # 최근 대화부터 표시 (리스트 복사 없이 인덱스로 역순 순회)
+        history = st.session_state.chat_history
+        for idx in range(len(history) - 1, max(-1, len(history) - 1 - CHAT_HISTORY_DISPLAY), -1):
+            chat = history[idx]
             with st.expander(f"💬 {chat['timestamp']} - {chat['user'][:50]}..."):
                 st.write(f"**사용자:** {chat['user']}")
                 
-                # AI 답변 포맷팅
+                # AI 답변 포맷팅 (저장된 마크다운 재사용, 없으면 정리 후 저장)
                 ai_response = chat['ai']
                 if ai_response:
-                    # 이스케이프된 \n을 실제 줄바꿈으로 변환
-                    formatted_ai = ai_response.replace("\\n", "\n")
-                    
-                    # 마크다운 형식으로 변환
-                    # ### 제목 형식을 HTML로 변환
-                    formatted_ai = formatted_ai.replace("### ", "<h3>").replace("\n", "</h3>\n")
-                    
-                    # 번호가 있는 목록 처리
-                    import re
-                    formatted_ai = re.sub(r'(\d+)\.\s+', r'<strong>\1.</strong> ', formatted_ai)
-                    
-                    # 줄바꿈을 HTML로 변환
-                    formatted_ai = formatted_ai.replace("\n\n", "</p><p>")
-                    formatted_ai = formatted_ai.replace("\n", "<br>")
-                    
-                    # HTML 태그로 감싸기
-                    formatted_ai = f"<p>{formatted_ai}</p>"
-                    
-                    st.markdown(f"**AI:** {formatted_ai}", unsafe_allow_html=True)
+                    formatted_ai = chat.get('ai_markdown')
+                    if not formatted_ai:
+                        formatted_ai = chat['ai_markdown'] = _format_ai_markdown(ai_response)
+                    st.markdown(f"**AI:** {formatted_ai}")
                 else:
                     st.write(f"**AI:** {ai_response}")
                 
                 if 'agent_type' in chat:
-                    agent_names = {
-                        "budget": "💰 예산 관리",
-                        "investment": "📈 투자 관리",
-                        "tax": "🧾 세금 관리",
-                        "retirement": "🎯 은퇴 계획",
-                        "comprehensive": "🤖 종합 분석"
-                    }
-                    agent_name = agent_names.get(chat["agent_type"], "AI 어드바이저")
+                    agent_name = AGENT_NAMES.get(chat["agent_type"], "AI 어드바이저")
                     st.caption(f"답변 제공: {agent_name}")
     else:
         st.info("💡 아직 대화 기록이 없습니다. 질문을 해보세요!")
@@ -666,8 +969,8 @@ def render_portfolio_simulation_tab():
             # 위험 성향
             risk_tolerance = st.selectbox(
                 "위험 성향",
-                ["conservative", "moderate", "aggressive"],
-                format_func=lambda x: {"conservative": "보수적", "moderate": "중립적", "aggressive": "공격적"}[x]
+                list(RISK_TOLERANCE_LABELS),
+                format_func=RISK_TOLERANCE_LABELS.get
             )
         
         # 시뮬레이션 실행
@@ -704,27 +1007,14 @@ def render_portfolio_simulation_tab():
                 "num_portfolios": num_portfolios
             }
             
-            # API 호출 (실제 처리)
-            response = call_api("/portfolio/efficient-frontier", efficient_frontier_data)
+            # API 호출 (백그라운드 스레드에서 실행, 대기 중 진행 상황 표시)
+            response = run_api_with_progress(
+                "/portfolio/efficient-frontier", efficient_frontier_data,
+                progress_bar, status_text, steps
+            )
             
-            # API 호출 완료 후 나머지 단계 표시
+            # API 호출 완료 후 최종 단계 표시
             if response:
-                progress_bar.progress(0.3)
-                status_text.text(steps[1])
-                time.sleep(0.2)
-                
-                progress_bar.progress(0.5)
-                status_text.text(steps[2])
-                time.sleep(0.2)
-                
-                progress_bar.progress(0.7)
-                status_text.text(steps[3])
-                time.sleep(0.2)
-                
-                progress_bar.progress(0.9)
-                status_text.text(steps[4])
-                time.sleep(0.2)
-                
                 progress_bar.progress(1.0)
                 status_text.text(steps[5])
             else:
@@ -747,18 +1037,22 @@ def render_portfolio_simulation_tab():
                     
                     # 산점도 차트 생성
                     if PLOTLY_AVAILABLE:
+                        go, _ = load_plotly()
                         returns = [p["return"] for p in portfolios]
                         volatilities = [p["volatility"] for p in portfolios]
                         
-                        fig = px.scatter(
+                        # WebGL 렌더링으로 다수 포인트 표시
+                        fig = go.Figure(go.Scattergl(
                             x=volatilities,
                             y=returns,
-                            title="효율적 프론티어",
-                            labels={"x": "변동성 (리스크)", "y": "기대 수익률"},
-                            color_discrete_sequence=['blue']
-                        )
+                            mode='markers',
+                            marker=dict(color='blue')
+                        ))
                         
                         fig.update_layout(
+                            title="효율적 프론티어",
+                            xaxis_title="변동성 (리스크)",
+                            yaxis_title="기대 수익률",
                             height=500,
                             showlegend=False
                         )
@@ -768,6 +1062,7 @@ def render_portfolio_simulation_tab():
                         st.warning("plotly가 설치되지 않아 차트를 표시할 수 없습니다.")
                         # 대신 데이터 테이블로 표시
                         st.write("**포트폴리오 데이터:**")
+                        import pandas as pd  # 표 표시가 필요할 때만 import
                         portfolio_df = pd.DataFrame(portfolios)
                         st.dataframe(portfolio_df[["return", "volatility"]].head(10))
                     
@@ -790,6 +1085,7 @@ def render_portfolio_simulation_tab():
                         st.write("**📊 자산 배분**")
                         allocation_data = optimal.get("allocation", {})
                         if allocation_data:
+                            import pandas as pd  # 표 표시가 필요할 때만 import
                             allocation_df = pd.DataFrame([
                                 {"종목": symbol, "비중": f"{weight:.1f}%"}
                                 for symbol, weight in allocation_data.items()
@@ -807,6 +1103,70 @@ def render_portfolio_simulation_tab():
         else:
             st.warning("⚠️ 종목 코드를 입력해주세요.")
 
+def render_sentiment_result(result):
+    """감정 분석 결과 표시"""
+    if result and "error" not in result:
+        st.success("✅ 감정 분석이 완료되었습니다!")
+
+        # 결과 표시
+        sentiment_score = result.get("overall_sentiment", 0)
+        sentiment_label = result.get("sentiment_label", "중립")
+
+        st.subheader("📊 감정 분석 결과")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("감정 점수", f"{sentiment_score:.2f}")
+        with col2:
+            st.metric("감정 레이블", sentiment_label)
+
+        # 감정 점수 시각화
+        if PLOTLY_AVAILABLE:
+            st.plotly_chart(create_sentiment_gauge(round(sentiment_score, 2)), use_container_width=True)
+        else:
+            st.warning("plotly가 설치되지 않아 게이지 차트를 표시할 수 없습니다.")
+            # 대신 간단한 텍스트로 표시
+            st.write(f"**감정 점수:** {sentiment_score:.2f}")
+            if sentiment_score > 0.3:
+                st.success("긍정적")
+            elif sentiment_score < -0.3:
+                st.error("부정적")
+            else:
+                st.info("중립적")
+
+        # 현재 탭에 결과 표시 (다른 탭으로 이동하지 않음)
+        st.info("💡 감정 분석 결과는 현재 탭에서 확인할 수 있습니다.")
+
+def render_prediction_result(result):
+    """시장 예측 결과 표시"""
+    if result and "error" not in result:
+        st.success("✅ 시장 예측이 완료되었습니다!")
+
+        # 결과 표시
+        st.subheader("🔮 시장 예측 결과")
+
+        prediction = result.get("trend_direction", "상승")
+        confidence = result.get("confidence_level", 0)
+        risk_level = result.get("risk_level", "보통")
+        recommendation = result.get("recommendation", "")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("예측 방향", prediction)
+        with col2:
+            st.metric("신뢰도", f"{confidence:.1f}%")
+        with col3:
+            st.metric("리스크 레벨", risk_level)
+
+        if recommendation:
+            st.write("**💡 투자 권고사항**")
+            st.info(recommendation)
+    else:
+        st.error("❌ 시장 예측에 실패했습니다.")
+
+        # 현재 탭에 결과 표시 (다른 탭으로 이동하지 않음)
+        st.info("💡 분석 결과는 현재 탭에서 확인할 수 있습니다.")
+
 def render_investment_analysis_tab():
     """투자 분석 탭"""
     st.header("🎯 투자 분석")
@@ -828,12 +1188,15 @@ def render_investment_analysis_tab():
             
             analysis_type = st.selectbox(
                 "분석 유형",
-                ["sentiment", "prediction"],
-                format_func=lambda x: {"sentiment": "감정 분석", "prediction": "시장 예측"}[x]
+                list(ANALYSIS_TYPE_LABELS),
+                format_func=ANALYSIS_TYPE_LABELS.get
             )
         
+        # 예측 설정 기본값
+        days = 30
+        confidence_level = 0.8
         with col2:
-            if analysis_type == "prediction":
+            if analysis_type in ("prediction", "both"):
                 days = st.slider("예측 기간 (일)", min_value=7, max_value=90, value=30)
                 confidence_level = st.slider("신뢰도", min_value=0.5, max_value=0.95, value=0.8, step=0.05)
         
@@ -843,116 +1206,25 @@ def render_investment_analysis_tab():
                 # 로딩 상태 시작
                 st.session_state.is_loading = True
                 
-                # 프로그레스 바와 로딩 메시지 표시
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                # 단계별 진행 상황 표시
-                steps = [
-                    "🔄 투자 분석 시작...",
-                    "🔄 데이터 수집 중...",
-                    "🔄 분석 처리 중...",
-                    "🔄 결과 생성 중...",
-                    "✅ 완료!"
-                ]
-                
-                # 첫 번째 단계 표시
-                progress_bar.progress(0.2)
-                status_text.text(steps[0])
-                
-                if analysis_type == "sentiment":
-                    # 감정 분석
-                    sentiment_data = {
-                        "text_data": [f"분석 대상: {symbol}"]
-                    }
-                    response = call_api("/ai/sentiment-analysis", sentiment_data)
+                # 진행 상태는 st.status 하나로 표시 (시작/완료 시에만 갱신)
+                with st.status("🔄 투자 분석 중...") as status:
+                    # API 호출 (선택한 분석을 한 번의 요청으로 처리)
+                    kinds = ["sentiment", "prediction"] if analysis_type == "both" else [analysis_type]
+                    response = analyze_symbol(symbol, kinds, days, confidence_level) or {}
+                    results = {kind: response.get(kind) for kind in kinds}
                     
-                    if response and "error" not in response:
-                        st.success("✅ 감정 분석이 완료되었습니다!")
-                        
-                        # 결과 표시
-                        sentiment_score = response.get("overall_sentiment", 0)
-                        sentiment_label = response.get("sentiment_label", "중립")
-                        
-                        st.subheader("📊 감정 분석 결과")
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.metric("감정 점수", f"{sentiment_score:.2f}")
-                        with col2:
-                            st.metric("감정 레이블", sentiment_label)
-                        
-                        # 감정 점수 시각화
-                        if PLOTLY_AVAILABLE:
-                            fig = go.Figure(go.Indicator(
-                                mode="gauge+number+delta",
-                                value=sentiment_score,
-                                domain={'x': [0, 1], 'y': [0, 1]},
-                                title={'text': "시장 감정 지수"},
-                                delta={'reference': 0},
-                                gauge={
-                                    'axis': {'range': [-1, 1]},
-                                    'bar': {'color': "darkblue"},
-                                    'steps': [
-                                        {'range': [-1, -0.3], 'color': "lightgray"},
-                                        {'range': [-0.3, 0.3], 'color': "yellow"},
-                                        {'range': [0.3, 1], 'color': "lightgreen"}
-                                    ],
-                                    'threshold': {
-                                        'line': {'color': "red", 'width': 4},
-                                        'thickness': 0.75,
-                                        'value': 0.8
-                                    }
-                                }
-                            ))
-                            
-                            fig.update_layout(height=400)
-                            st.plotly_chart(fig, use_container_width=True)
-                        else:
-                            st.warning("plotly가 설치되지 않아 게이지 차트를 표시할 수 없습니다.")
-                            # 대신 간단한 텍스트로 표시
-                            st.write(f"**감정 점수:** {sentiment_score:.2f}")
-                            if sentiment_score > 0.3:
-                                st.success("긍정적")
-                            elif sentiment_score < -0.3:
-                                st.error("부정적")
-                            else:
-                                st.info("중립적")
-                        
-                        # 현재 탭에 결과 표시 (다른 탭으로 이동하지 않음)
-                        st.info("💡 감정 분석 결과는 현재 탭에서 확인할 수 있습니다.")
-                        
-                else:
-                    # 시장 예측
-                    response = call_api(f"/ai/market-prediction/{symbol}?days={days}&confidence_level={confidence_level}")
-                    
-                    if response and "error" not in response:
-                        st.success("✅ 시장 예측이 완료되었습니다!")
-                        
-                        # 결과 표시
-                        st.subheader("🔮 시장 예측 결과")
-                        
-                        prediction = response.get("trend_direction", "상승")
-                        confidence = response.get("confidence_level", 0)
-                        risk_level = response.get("risk_level", "보통")
-                        recommendation = response.get("recommendation", "")
-                        
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("예측 방향", prediction)
-                        with col2:
-                            st.metric("신뢰도", f"{confidence:.1f}%")
-                        with col3:
-                            st.metric("리스크 레벨", risk_level)
-                        
-                        if recommendation:
-                            st.write("**💡 투자 권고사항**")
-                            st.info(recommendation)
+                    if all(result and "error" not in result for result in results.values()):
+                        status.update(label="✅ 완료!", state="complete")
                     else:
-                        st.error("❌ 시장 예측에 실패했습니다.")
-                        
-                        # 현재 탭에 결과 표시 (다른 탭으로 이동하지 않음)
-                        st.info("💡 분석 결과는 현재 탭에서 확인할 수 있습니다.")
+                        status.update(label="❌ 분석 실패", state="error")
+                
+                # 로딩 상태 종료
+                st.session_state.is_loading = False
+                
+                if "sentiment" in results:
+                    render_sentiment_result(results["sentiment"])
+                if "prediction" in results:
+                    render_prediction_result(results["prediction"])
             else:
                 st.warning("⚠️ 종목 코드를 입력해주세요.")
 
@@ -974,8 +1246,8 @@ def render_comprehensive_analysis_tab():
             savings = st.number_input("현재 저축액 (원)", min_value=0, value=10000000, step=1000000)
             risk_tolerance = st.selectbox(
                 "위험 성향",
-                ["conservative", "moderate", "aggressive"],
-                format_func=lambda x: {"conservative": "보수적", "moderate": "중립적", "aggressive": "공격적"}[x]
+                list(RISK_TOLERANCE_LABELS),
+                format_func=RISK_TOLERANCE_LABELS.get
             )
         
         # 종합분석 실행 버튼
@@ -994,7 +1266,6 @@ def render_comprehensive_analysis_tab():
             
             # 종합분석 실행
             st.session_state.quick_analysis = "detailed"
-            st.session_state.ai_consultation_auto_submit = True
             
             # 분석 질문 생성
             analysis_query = f"""
@@ -1015,99 +1286,48 @@ def render_comprehensive_analysis_tab():
             5. 위험 관리 방안
             """
             
-            st.session_state.user_query = analysis_query
-            
-            # 종합분석 바로 실행
-            st.success("✅ 종합분석을 시작합니다...")
-            
             # 로딩 상태 시작
             st.session_state.is_loading = True
             
-            # 프로그레스 바와 로딩 메시지 표시
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            # 단계별 진행 상황 표시
-            steps = [
-                "🔄 종합분석 시작...",
-                "🔄 재무 건강도 분석 중...",
-                "🔄 투자 포트폴리오 구성 중...",
-                "🔄 세금 절약 전략 분석 중...",
-                "🔄 은퇴 준비 계획 수립 중...",
-                "✅ 완료!"
-            ]
-            
-            # 첫 번째 단계 표시
-            progress_bar.progress(0.1)
-            status_text.text(steps[0])
-            
-            # API 호출 (실제 처리)
-            response = call_api("/query", {"query": analysis_query, "user_data": user_data})
-            
-            # API 호출 완료 후 나머지 단계 표시
-            if response:
-                progress_bar.progress(0.3)
-                status_text.text(steps[1])
-                time.sleep(0.2)
-                
-                progress_bar.progress(0.5)
-                status_text.text(steps[2])
-                time.sleep(0.2)
+            # 진행 상태는 st.status 하나로 표시 (스트리밍 답변도 이 안에서 미리 보여줌)
+            with st.status("🔄 종합분석 진행 중...", expanded=True) as status:
+                # 스트리밍 응답 우선 (생성되는 답변을 바로 표시, 완료 후 아래에서 다시 정리해 표시)
+                stream_area = st.empty()
+                response = stream_query(analysis_query, user_data, stream_area)
+                stream_area.empty()
                 
-                progress_bar.progress(0.7)
-                status_text.text(steps[3])
-                time.sleep(0.2)
-                
-                progress_bar.progress(0.9)
-                status_text.text(steps[4])
-                time.sleep(0.2)
+                # 스트리밍 미지원 시 API 호출
+                if response is None:
+                    response = post_api("/query", {"query": analysis_query, "user_data": user_data})
                 
-                progress_bar.progress(1.0)
-                status_text.text(steps[5])
-            else:
-                # API 호출 실패 시
-                progress_bar.progress(1.0)
-                status_text.text("❌ 분석 실패")
+                if response and "answer" in response:
+                    status.update(label="✅ 완료!", state="complete", expanded=False)
+                else:
+                    status.update(label="❌ 분석 실패", state="error", expanded=False)
             
             # 로딩 상태 종료
             st.session_state.is_loading = False
             
             if response and "answer" in response:
-                # 답변 내용 추출
-                answer_text = response["answer"]
-                
-                # 문자열이 아닌 경우 문자열로 변환
-                if not isinstance(answer_text, str):
-                    answer_text = str(answer_text)
-                
-                # 딕셔너리 형태의 문자열인 경우 실제 내용만 추출
-                if answer_text.startswith("{'answer': '") or answer_text.startswith('{"answer": "'):
-                    try:
-                        import json
-                        import ast
-                        try:
-                            parsed = ast.literal_eval(answer_text)
-                            if isinstance(parsed, dict) and "answer" in parsed:
-                                answer_text = parsed["answer"]
-                        except:
-                            try:
-                                parsed = json.loads(answer_text)
-                                if isinstance(parsed, dict) and "answer" in parsed:
-                                    answer_text = parsed["answer"]
-                            except:
-                                pass
-                    except:
-                        pass
+                # 답변 내용 추출 (딕셔너리 형태의 문자열인 경우 실제 내용만 추출)
+                answer_text = _unwrap_answer(response["answer"])
                 
                 # 결과 표시
+                # 마크다운 정리는 한 번만 수행하고 히스토리에 함께 저장
+                formatted_answer = _format_ai_markdown(answer_text) if answer_text else ""
+                
                 st.success("✅ 종합분석이 완료되었습니다!")
                 st.subheader("📊 종합 재무 분석 결과")
-                st.markdown(answer_text)
+                if formatted_answer:
+                    st.markdown(formatted_answer)
+                else:
+                    st.write("답변을 생성할 수 없습니다.")
                 
                 # 채팅 히스토리에 추가
-                st.session_state.chat_history.append({
+                append_chat_history({
                     "user": analysis_query,
                     "ai": answer_text,
+                    "ai_markdown": formatted_answer,
                     "timestamp": datetime.now().strftime("%H:%M"),
                     "type": "comprehensive_analysis"
                 })
@@ -1117,18 +1337,36 @@ def render_comprehensive_analysis_tab():
                 st.info("💡 AI 상담 탭으로 이동하여 대화 기록을 확인하세요.")
             else:
                 st.error("❌ 종합분석에 실패했습니다.")
-                if response and "detail" in response:
-                    st.error(f"오류 상세: {response['detail']}")
+                if response is None:
+                    st.error("**API 서버 연결 실패**")
+                    st.markdown(QUERY_CONNECTION_HELP)
+                else:
+                    # 에이전트/스트리밍 실패는 error, FastAPI 예외는 detail로 전달됨
+                    error_detail = response.get("error") or response.get("detail")
+                    if error_detail:
+                        st.error(f"**API 오류:** {error_detail}")
 
 def main():
     """메인 함수"""
+    # 세션 상태 초기화
+    init_session_state()
+    
     # 헤더 최적화
     st.title("💰 AI 재무관리 어드바이저")
     
-    # API 상태 확인 (실시간)
-    with st.spinner("API 서버 연결 확인 중..."):
-        api_healthy = check_api_health()
-        st.session_state.api_healthy = api_healthy
+    # API 상태 확인 (세션당 한 번, 이후 연결 오류가 발생하면 연결 끊김으로 처리)
+    if get_api_circuit_breaker().last_connection_error > st.session_state.api_checked_at:
+        st.session_state.api_healthy = False
+        st.session_state.api_checked_at = time.monotonic()
+    if st.session_state.api_healthy is None:
+        # 헬스 체크 응답을 기다리는 동안 차트용 plotly import를 백그라운드에서 미리 수행
+        # (스크립트 컨텍스트가 없는 스레드이므로 캐시 함수 대신 모듈만 import)
+        if PLOTLY_AVAILABLE:
+            get_api_executor().submit(import_module, "plotly.express")
+        with st.spinner("API 서버 연결 확인 중..."):
+            st.session_state.api_healthy = check_api_health()
+            st.session_state.api_checked_at = time.monotonic()
+    api_healthy = st.session_state.api_healthy
     
     if not api_healthy:
         st.error("⚠️ API 서버에 연결할 수 없습니다.")
@@ -1136,41 +1374,19 @@ def main():
         col1, col2 = st.columns(2)
         
         with col1:
-            st.subheader("🔧 문제 해결 방법")
-            st.write("""
-            1. **02_start_app.bat**를 다시 실행해보세요
-            2. API 서버 창이 정상적으로 열렸는지 확인하세요
-            3. 회사 Azure OpenAI 서비스 연결을 기다려주세요 (1-2분 소요)
-            4. 포트 8000이 다른 프로그램에서 사용 중인지 확인하세요
-            5. 방화벽 설정을 확인하세요
-            """)
-            
-            st.subheader("🔍 Azure OpenAI 설정 확인")
-            st.write("""
-            AI 상담이 작동하지 않는 경우:
-            1. .env 파일에서 다음 설정을 확인하세요:
-               - AOAI_ENDPOINT=https://your-resource.openai.azure.com/
-               - AOAI_API_KEY=your_azure_openai_api_key_here
-               - AOAI_DEPLOY_EMBED_3_SMALL=text-embedding-3-small
-            2. Azure OpenAI Studio에서 임베딩 모델이 올바르게 배포되었는지 확인하세요
-            3. 배포 이름이 .env 파일의 AOAI_DEPLOY_EMBED_3_SMALL과 일치하는지 확인하세요
-            """)
+            # 문제 해결 안내를 한 번의 markdown 호출로 출력 (요소 수 감소)
+            st.markdown(TROUBLESHOOTING_GUIDE)
         
         with col2:
             st.subheader("📋 수동 실행 방법")
-            st.code("""
-# API 서버 실행
-python -m uvicorn src.api.main:app --host 0.0.0.0 --port 8000 --reload
-
-# Streamlit 실행 (새 터미널에서)
-python -m streamlit run main.py --server.port 8501
-            """)
+            st.code(MANUAL_RUN_COMMANDS)
         
         st.info("💡 회사 Azure OpenAI 서비스 사용 시 첫 연결에 시간이 걸릴 수 있습니다.")
         
         # API 서버가 없을 때 안내
         st.warning("API 서버가 실행되지 않아 일부 기능을 사용할 수 없습니다.")
         st.info("💡 API 서버를 시작한 후 다시 시도해주세요.")
+        st.button("🔄 연결 다시 확인", on_click=refresh_api_health)
         return
     
     st.success("✅ API 서버에 연결되었습니다!")
@@ -1179,8 +1395,7 @@ python -m streamlit run main.py --server.port 8501
     create_market_dashboard()
     
     # 탭 생성 (개선된 기능)
-    tab_names = ["💬 AI 상담", "📊 종합 분석", "📈 포트폴리오 시뮬레이션", "🎯 투자 분석"]
-    tabs = st.tabs(tab_names)
+    tabs = st.tabs(TAB_NAMES)
     
     # AI 상담 탭
     with tabs[0]:
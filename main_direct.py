@@ -6,12 +6,15 @@ API 서버 없이 모든 기능을 직접 실행하는 통합 애플리케이션
 
 import streamlit as st
 import json
+import re
 import logging
 from datetime import datetime
 import time
 import sys
 import os
+import threading
 from pathlib import Path
+from types import SimpleNamespace
 from dotenv import load_dotenv
 
 # 페이지 설정
@@ -25,7 +28,6 @@ st.set_page_config(
 # plotly import를 안전하게 처리
 try:
     import plotly.graph_objects as go
-    import plotly.express as px
     PLOTLY_AVAILABLE = True
 except ImportError:
     PLOTLY_AVAILABLE = False
@@ -48,20 +50,115 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# 직접 실행을 위한 핵심 모듈들 import (안전한 import)
-try:
-    from src.core.config import settings
-    from src.rag.knowledge_base import KnowledgeBase
-    from src.agents.multi_agent_system import MultiAgentSystem
-    from src.core.financial_data import financial_data
-    from src.core.portfolio_simulator import portfolio_simulator
-    from src.core.advanced_ai import advanced_ai
-    FULL_FEATURES_AVAILABLE = True
+# 직접 실행을 위한 핵심 모듈들 지연 import (처음 필요할 때 한 번만 시도, 실패 결과도 캐시)
+@st.cache_resource(show_spinner=False)
+def load_full_features():
+    """전체 기능 모듈 묶음 반환 (import 실패 시 None → 간단 모드)"""
+    try:
+        from src.core.config import settings
+        from src.rag.knowledge_base import KnowledgeBase
+        from src.agents.multi_agent_system import MultiAgentSystem
+        from src.core.financial_data import financial_data
+        from src.core.portfolio_simulator import portfolio_simulator
+        from src.core.advanced_ai import advanced_ai
+    except ImportError as e:
+        logger.warning(f"⚠️ 전체 기능 모듈 로드 실패: {e}")
+        logger.info("🔄 간단 모드로 전환합니다.")
+        return None
+    
     logger.info("✅ 전체 기능 모듈 로드 성공")
-except ImportError as e:
-    logger.warning(f"⚠️ 전체 기능 모듈 로드 실패: {e}")
-    logger.info("🔄 간단 모드로 전환합니다.")
-    FULL_FEATURES_AVAILABLE = False
+    return SimpleNamespace(
+        settings=settings,
+        KnowledgeBase=KnowledgeBase,
+        MultiAgentSystem=MultiAgentSystem,
+        financial_data=financial_data,
+        portfolio_simulator=portfolio_simulator,
+        advanced_ai=advanced_ai
+    )
+
+# 맞춤 조언 키워드 (서로 겹치지 않으므로 findall 한 번으로 모두 찾을 수 있음)
+ADVICE_KEYWORD_RE = re.compile("월급|연봉|투자|주식|부동산|저축|적금|대출|빚|500|300")
+
+# 상담 카테고리 선택지와 탭 이름
+CATEGORY_LABELS = {
+    "general": "일반 상담",
+    "budget": "예산 관리",
+    "investment": "투자 상담",
+    "tax": "세무 상담",
+    "retirement": "퇴직 계획"
+}
+TAB_NAMES = ("💬 재무 상담", "📊 포트폴리오 분석", "📈 시장 데이터", "📋 사용법")
+
+# 카테고리별 담당 에이전트 (없는 카테고리는 general_agent)
+CATEGORY_AGENTS = {
+    "budget": "budget_agent",
+    "investment": "investment_agent",
+    "tax": "tax_agent",
+    "retirement": "retirement_agent"
+}
+
+# 카테고리별 간단 모드 기본 응답
+SIMPLE_ADVICE_RESPONSES = {
+    "budget": {
+        "title": "💰 예산 관리 조언",
+        "advice": [
+            "1. 수입의 50-30-20 법칙을 따르세요 (필수지출 50%, 선택지출 30%, 저축 20%)",
+            "2. 모든 지출을 기록하고 분류하세요",
+            "3. 월별 예산을 세우고 정기적으로 검토하세요",
+            "4. 비상금을 3-6개월 생활비만큼 확보하세요"
+        ]
+    },
+    "investment": {
+        "title": "📈 투자 조언",
+        "advice": [
+            "1. 분산 투자로 리스크를 줄이세요",
+            "2. 장기 투자 관점을 유지하세요",
+            "3. 정기적인 포트폴리오 리밸런싱을 하세요",
+            "4. 투자 원금의 10% 이상을 한 번에 투자하지 마세요"
+        ]
+    },
+    "tax": {
+        "title": "🧾 세무 조언",
+        "advice": [
+            "1. 연말정산 시 필요한 서류를 미리 준비하세요",
+            "2. 세금공제 혜택을 최대한 활용하세요",
+            "3. 투자 관련 세금 혜택을 확인하세요",
+            "4. 전문가와 상담하여 세무 계획을 수립하세요"
+        ]
+    },
+    "retirement": {
+        "title": "🏠 퇴직 계획 조언",
+        "advice": [
+            "1. 퇴직 후 필요 생활비를 계산하세요",
+            "2. 연금 상품을 조기에 가입하세요",
+            "3. 부동산 투자도 고려해보세요",
+            "4. 정기적으로 퇴직 계획을 점검하세요"
+        ]
+    },
+    "general": {
+        "title": "💡 일반 재무 조언",
+        "advice": [
+            "1. 수입과 지출을 정확히 파악하세요",
+            "2. 목표를 세우고 단계별로 실행하세요",
+            "3. 정기적으로 재무 상태를 점검하세요",
+            "4. 전문가 상담을 받아보세요"
+        ]
+    }
+}
+
+# 샘플 포트폴리오 데이터 (정적이므로 JSON 문자열도 한 번만 만들어 둠)
+SAMPLE_PORTFOLIO = {
+    "stocks": [
+        {"symbol": "AAPL", "shares": 10, "avg_price": 150},
+        {"symbol": "GOOGL", "shares": 5, "avg_price": 2800},
+        {"symbol": "MSFT", "shares": 8, "avg_price": 300}
+    ],
+    "bonds": [
+        {"name": "국채 10년", "amount": 10000000, "yield": 0.03}
+    ],
+    "cash": 5000000
+}
+SAMPLE_PORTFOLIO_JSON = json.dumps(SAMPLE_PORTFOLIO, indent=2, ensure_ascii=False)
 
 class DirectFinanceAdvisor:
     """API 서버 없이 직접 실행하는 재무 관리 어드바이저"""
@@ -70,12 +167,34 @@ class DirectFinanceAdvisor:
         self.knowledge_base = None
         self.multi_agent_system = None
         self.is_initialized = False
+        self.init_failed = False  # 실패한 초기화는 사이드바 버튼으로만 재시도
+        self._init_lock = threading.Lock()  # 세션 간 공유 인스턴스이므로 동시 초기화 방지
+        
+    def initialize(self, force: bool = False):
+        """시스템 초기화 (이미 초기화된 경우 force=True일 때만 다시 구성)"""
+        if self.is_initialized and not force:
+            return True
         
-    def initialize(self):
-        """시스템 초기화"""
+        with self._init_lock:
+            # 락을 기다리는 동안 다른 세션이 초기화를 마쳤으면 다시 구성하지 않음
+            if self.is_initialized and not force:
+                return True
+            
+            # 재초기화 전 기존 인스턴스를 해제해 두 벌이 동시에 메모리에 남지 않도록 함
+            self.knowledge_base = None
+            self.multi_agent_system = None
+            self.is_initialized = False
+            
+            success = self._build_components()
+            self.init_failed = not success
+            return success
+    
+    def _build_components(self) -> bool:
+        """지식베이스와 Multi Agent 시스템 구성 (initialize에서 락을 잡은 상태로 호출)"""
         try:
             with st.spinner("🔄 시스템 초기화 중..."):
-                if not FULL_FEATURES_AVAILABLE:
+                full = load_full_features()
+                if full is None:
                     # 간단 모드로 초기화
                     st.warning("⚠️ 전체 기능 모듈을 사용할 수 없어 간단 모드로 실행합니다.")
                     self.is_initialized = True
@@ -84,7 +203,7 @@ class DirectFinanceAdvisor:
                 
                 # 전체 기능 모드 초기화
                 # 지식베이스 초기화
-                self.knowledge_base = KnowledgeBase()
+                self.knowledge_base = full.KnowledgeBase()
                 kb_success = self.knowledge_base.initialize()
                 
                 if not kb_success:
@@ -92,7 +211,7 @@ class DirectFinanceAdvisor:
                     return False
                 
                 # Multi Agent 시스템 초기화
-                self.multi_agent_system = MultiAgentSystem()
+                self.multi_agent_system = full.MultiAgentSystem()
                 agent_success = self.multi_agent_system.initialize(self.knowledge_base)
                 
                 if not agent_success:
@@ -112,37 +231,31 @@ class DirectFinanceAdvisor:
             return True
     
     def get_financial_advice(self, user_input: str, category: str = "general") -> dict:
-        """재무 상담 제공"""
-        if not self.is_initialized:
+        """재무 상담 제공 (전체 기능 모듈과 에이전트는 첫 요청 시 초기화)"""
+        if not self.is_initialized and (self.init_failed or not self.initialize()):
             return {"error": "시스템이 초기화되지 않았습니다."}
         
+        # 요청 시각은 한 번만 계산해 간단 모드 대체 경로에도 전달
+        timestamp = datetime.now().isoformat()
+        
         try:
             # 간단 모드인 경우 내장 로직 사용
-            if not FULL_FEATURES_AVAILABLE or not hasattr(self, 'multi_agent_system') or self.multi_agent_system is None:
-                return self._get_simple_advice(user_input, category)
+            if self.multi_agent_system is None:
+                return self._get_simple_advice(user_input, category, timestamp)
             
             # 전체 기능 모드인 경우 에이전트 사용
             # 카테고리별 에이전트 선택
-            if category == "budget":
-                agent_name = "budget_agent"
-            elif category == "investment":
-                agent_name = "investment_agent"
-            elif category == "tax":
-                agent_name = "tax_agent"
-            elif category == "retirement":
-                agent_name = "retirement_agent"
-            else:
-                agent_name = "general_agent"
+            agent_name = CATEGORY_AGENTS.get(category, "general_agent")
+            agent = self.multi_agent_system.agents.get(agent_name)
             
             # 에이전트 실행
-            if agent_name in self.multi_agent_system.agents:
-                agent = self.multi_agent_system.agents[agent_name]
+            if agent is not None:
                 result = agent.run(user_input)
                 return {
                     "success": True,
                     "response": result,
                     "category": category,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": timestamp
                 }
             else:
                 # 일반적인 응답
@@ -150,149 +263,86 @@ class DirectFinanceAdvisor:
                     "success": True,
                     "response": f"재무 상담: {user_input}에 대한 조언을 제공합니다.",
                     "category": "general",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": timestamp
                 }
                 
         except Exception as e:
             logger.error(f"상담 처리 오류: {e}")
             # 오류 발생 시 간단 모드로 전환
-            return self._get_simple_advice(user_input, category)
+            return self._get_simple_advice(user_input, category, timestamp)
     
-    def _get_simple_advice(self, user_input: str, category: str) -> dict:
+    def _get_simple_advice(self, user_input: str, category: str, timestamp: str) -> dict:
         """간단 모드 재무 상담 제공"""
         try:
-            # 카테고리별 기본 응답
-            responses = {
-                "budget": {
-                    "title": "💰 예산 관리 조언",
-                    "advice": [
-                        "1. 수입의 50-30-20 법칙을 따르세요 (필수지출 50%, 선택지출 30%, 저축 20%)",
-                        "2. 모든 지출을 기록하고 분류하세요",
-                        "3. 월별 예산을 세우고 정기적으로 검토하세요",
-                        "4. 비상금을 3-6개월 생활비만큼 확보하세요"
-                    ]
-                },
-                "investment": {
-                    "title": "📈 투자 조언",
-                    "advice": [
-                        "1. 분산 투자로 리스크를 줄이세요",
-                        "2. 장기 투자 관점을 유지하세요",
-                        "3. 정기적인 포트폴리오 리밸런싱을 하세요",
-                        "4. 투자 원금의 10% 이상을 한 번에 투자하지 마세요"
-                    ]
-                },
-                "tax": {
-                    "title": "🧾 세무 조언",
-                    "advice": [
-                        "1. 연말정산 시 필요한 서류를 미리 준비하세요",
-                        "2. 세금공제 혜택을 최대한 활용하세요",
-                        "3. 투자 관련 세금 혜택을 확인하세요",
-                        "4. 전문가와 상담하여 세무 계획을 수립하세요"
-                    ]
-                },
-                "retirement": {
-                    "title": "🏠 퇴직 계획 조언",
-                    "advice": [
-                        "1. 퇴직 후 필요 생활비를 계산하세요",
-                        "2. 연금 상품을 조기에 가입하세요",
-                        "3. 부동산 투자도 고려해보세요",
-                        "4. 정기적으로 퇴직 계획을 점검하세요"
-                    ]
-                },
-                "general": {
-                    "title": "💡 일반 재무 조언",
-                    "advice": [
-                        "1. 수입과 지출을 정확히 파악하세요",
-                        "2. 목표를 세우고 단계별로 실행하세요",
-                        "3. 정기적으로 재무 상태를 점검하세요",
-                        "4. 전문가 상담을 받아보세요"
-                    ]
-                }
-            }
-            
-            selected = responses.get(category, responses["general"])
+            # 같은 질문은 캐시된 응답을 재사용하고 요청 시각만 새로 기록
+            return {**generate_simple_advice(user_input, category), "timestamp": timestamp}
             
-            # 사용자 입력에 따른 맞춤 조언 추가
-            custom_advice = self._generate_custom_advice(user_input, category)
-            
-            return {
-                "success": True,
-                "title": selected["title"],
-                "general_advice": selected["advice"],
-                "custom_advice": custom_advice,
-                "category": category,
-                "mode": "simple",
-                "timestamp": datetime.now().isoformat()
-            }
-                
         except Exception as e:
             logger.error(f"간단 상담 처리 오류: {e}")
             return {"error": f"상담 처리 중 오류 발생: {str(e)}"}
     
-    def _generate_custom_advice(self, user_input: str, category: str) -> str:
+    @staticmethod
+    def _generate_custom_advice(user_input: str, category: str) -> str:
         """사용자 입력에 따른 맞춤 조언 생성"""
-        input_lower = user_input.lower()
+        # 키워드 기반 맞춤 조언 (입력을 한 번만 스캔해 포함된 키워드 집합 생성)
+        keywords = set(ADVICE_KEYWORD_RE.findall(user_input.lower()))
         
-        # 키워드 기반 맞춤 조언
-        if "월급" in input_lower or "연봉" in input_lower:
-            if "500" in input_lower or "500만" in input_lower:
+        if "월급" in keywords or "연봉" in keywords:
+            if "500" in keywords:
                 return "월급 500만원 기준으로는 생활비 250만원, 여유자금 150만원, 저축 100만원으로 나누어 관리하는 것을 권장합니다."
-            elif "300" in input_lower or "300만" in input_lower:
+            elif "300" in keywords:
                 return "월급 300만원 기준으로는 생활비 180만원, 여유자금 60만원, 저축 60만원으로 관리하세요."
         
-        if "투자" in input_lower:
-            if "주식" in input_lower:
+        if "투자" in keywords:
+            if "주식" in keywords:
                 return "주식 투자는 장기 관점으로 접근하고, 분산 투자를 통해 리스크를 관리하세요."
-            elif "부동산" in input_lower:
+            elif "부동산" in keywords:
                 return "부동산 투자는 위치와 수익성을 중점적으로 고려하고, 정부 정책 변화에 주의하세요."
         
-        if "저축" in input_lower or "적금" in input_lower:
+        if "저축" in keywords or "적금" in keywords:
             return "정기적금이나 자동이체를 활용하여 꾸준한 저축 습관을 만드세요."
         
-        if "대출" in input_lower or "빚" in input_lower:
+        if "대출" in keywords or "빚" in keywords:
             return "대출은 최소한으로 유지하고, 고금리 대출부터 우선적으로 상환하세요."
         
         return "구체적인 상황에 맞는 상세한 상담을 위해 전문가와 상담하시는 것을 권장합니다."
     
     def analyze_portfolio(self, portfolio_data: dict) -> dict:
-        """포트폴리오 분석"""
-        if not self.is_initialized:
-            return {"error": "시스템이 초기화되지 않았습니다."}
+        """포트폴리오 분석 (에이전트 없이 시뮬레이터 모듈만 사용)"""
+        timestamp = datetime.now().isoformat()
         
         try:
             # 간단 모드인 경우 내장 로직 사용
-            if not FULL_FEATURES_AVAILABLE:
-                return self._analyze_portfolio_simple(portfolio_data)
+            full = load_full_features()
+            if full is None:
+                return self._analyze_portfolio_simple(portfolio_data, timestamp)
             
             # 전체 기능 모드인 경우 시뮬레이터 사용
-            analysis = portfolio_simulator.analyze_portfolio(portfolio_data)
+            analysis = full.portfolio_simulator.analyze_portfolio(portfolio_data)
             return {
                 "success": True,
                 "analysis": analysis,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
         except Exception as e:
             logger.error(f"포트폴리오 분석 오류: {e}")
             # 오류 발생 시 간단 모드로 전환
-            return self._analyze_portfolio_simple(portfolio_data)
+            return self._analyze_portfolio_simple(portfolio_data, timestamp)
     
-    def _analyze_portfolio_simple(self, portfolio_data: dict) -> dict:
+    def _analyze_portfolio_simple(self, portfolio_data: dict, timestamp: str) -> dict:
         """간단 모드 포트폴리오 분석"""
         try:
             # 간단한 포트폴리오 분석
-            total_value = 0
-            stock_value = 0
-            bond_value = 0
             cash_value = portfolio_data.get("cash", 0)
             
-            # 주식 가치 계산
-            for stock in portfolio_data.get("stocks", []):
-                current_price = stock.get("avg_price", 0) * 1.1  # 10% 상승 가정
-                stock_value += current_price * stock.get("shares", 0)
+            # 주식 가치 계산 (평균 매입가 대비 10% 상승 가정, 배열 연산으로 합산)
+            stocks = portfolio_data.get("stocks", [])
+            avg_prices = np.fromiter((stock.get("avg_price", 0) for stock in stocks), dtype=np.float64, count=len(stocks))
+            shares = np.fromiter((stock.get("shares", 0) for stock in stocks), dtype=np.float64, count=len(stocks))
+            stock_value = float(avg_prices.dot(shares) * 1.1)
             
             # 채권 가치 계산
-            for bond in portfolio_data.get("bonds", []):
-                bond_value += bond.get("amount", 0)
+            bond_value = sum(bond.get("amount", 0) for bond in portfolio_data.get("bonds", []))
             
             total_value = stock_value + bond_value + cash_value
             
@@ -322,7 +372,7 @@ class DirectFinanceAdvisor:
                 "risk_level": risk_level,
                 "recommendations": recommendations,
                 "mode": "simple",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
             
         except Exception as e:
@@ -331,83 +381,111 @@ class DirectFinanceAdvisor:
     
     def get_market_data(self, symbol: str) -> dict:
         """시장 데이터 조회"""
+        timestamp = datetime.now().isoformat()
+        
         try:
             # 간단 모드인 경우 모의 데이터 사용
-            if not FULL_FEATURES_AVAILABLE:
-                return self._get_market_data_simple(symbol)
+            full = load_full_features()
+            if full is None:
+                return self._get_market_data_simple(symbol, timestamp)
             
             # 전체 기능 모드인 경우 금융 데이터 모듈 사용
-            data = financial_data.get_stock_data(symbol)
+            data = full.financial_data.get_stock_data(symbol)
             return {
                 "success": True,
                 "data": data,
                 "symbol": symbol,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
         except Exception as e:
             logger.error(f"시장 데이터 조회 오류: {e}")
             # 오류 발생 시 간단 모드로 전환
-            return self._get_market_data_simple(symbol)
+            return self._get_market_data_simple(symbol, timestamp)
     
-    def _get_market_data_simple(self, symbol: str) -> dict:
+    def _get_market_data_simple(self, symbol: str, timestamp: str) -> dict:
         """간단 모드 시장 데이터 조회 (모의 데이터)"""
         try:
-            # 모의 주가 데이터 생성
-            import random
-            base_price = 100 + random.randint(-50, 100)
-            
-            # 30일간의 모의 데이터
-            dates = pd.date_range(start=datetime.now() - pd.Timedelta(days=30), periods=30, freq='D')
-            prices = []
-            
-            for i in range(30):
-                change = random.uniform(-0.05, 0.05)  # ±5% 변동
-                if i == 0:
-                    price = base_price
-                else:
-                    price = prices[-1] * (1 + change)
-                prices.append(round(price, 2))
-            
-            # 거래량 데이터
-            volumes = [random.randint(1000000, 5000000) for _ in range(30)]
-            
-            data = {
-                "symbol": symbol,
-                "current_price": prices[-1],
-                "change": round(prices[-1] - prices[-2], 2) if len(prices) > 1 else 0,
-                "change_percent": round(((prices[-1] - prices[-2]) / prices[-2] * 100), 2) if len(prices) > 1 else 0,
-                "data": [
-                    {
-                        "date": date.strftime("%Y-%m-%d"),
-                        "open": price,
-                        "high": price * 1.02,
-                        "low": price * 0.98,
-                        "close": price,
-                        "volume": volume
-                    }
-                    for date, price, volume in zip(dates, prices, volumes)
-                ]
-            }
+            # 모의 주가 데이터 생성 (심볼별 캐시)
+            data = generate_mock_market_data(symbol)
             
             return {
                 "success": True,
                 "data": data,
                 "note": "⚠️ 이는 모의 데이터입니다. 실제 투자 시에는 정확한 시장 데이터를 확인하세요.",
                 "mode": "simple",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
             
         except Exception as e:
             logger.error(f"간단 시장 데이터 조회 오류: {e}")
             return {"error": f"시장 데이터 조회 중 오류 발생: {str(e)}"}
 
+# 간단 모드 상담 응답 (시각을 제외하면 질문과 카테고리로 결정되므로 캐시)
+@st.cache_data(ttl=3600, max_entries=512, show_spinner=False)
+def generate_simple_advice(user_input: str, category: str) -> dict:
+    """카테고리 기본 조언과 맞춤 조언으로 상담 응답 생성"""
+    selected = SIMPLE_ADVICE_RESPONSES.get(category, SIMPLE_ADVICE_RESPONSES["general"])
+    
+    return {
+        "success": True,
+        "title": selected["title"],
+        "general_advice": selected["advice"],
+        "custom_advice": DirectFinanceAdvisor._generate_custom_advice(user_input, category),
+        "category": category,
+        "mode": "simple"
+    }
+
+# 모의 시장 데이터 (같은 심볼은 60초 동안 캐시)
+@st.cache_data(ttl=60, show_spinner=False)
+def generate_mock_market_data(symbol: str) -> dict:
+    """30일간의 모의 주가 데이터 생성 (NumPy 벡터 연산, 시세는 DataFrame 그대로 반환)"""
+    rng = np.random.default_rng()
+    base_price = 100 + int(rng.integers(-50, 101))
+    
+    # 첫날은 기준가, 이후 ±5% 일간 변동을 누적
+    changes = rng.uniform(-0.05, 0.05, 30)
+    changes[0] = 0.0
+    prices = np.round(base_price * np.cumprod(1 + changes), 2)
+    
+    # 거래량 데이터
+    volumes = rng.integers(1000000, 5000001, 30)
+    
+    dates = pd.date_range(start=datetime.now() - pd.Timedelta(days=30), periods=30, freq='D')
+    history = pd.DataFrame({
+        "date": dates.strftime("%Y-%m-%d"),
+        "open": prices,
+        "high": prices * 1.02,
+        "low": prices * 0.98,
+        "close": prices,
+        "volume": volumes
+    })
+    
+    return {
+        "symbol": symbol,
+        "current_price": float(prices[-1]),
+        "change": round(float(prices[-1] - prices[-2]), 2),
+        "change_percent": round(float((prices[-1] - prices[-2]) / prices[-2] * 100), 2),
+        "data": history
+    }
+
+# plotly.express 지연 로딩 (라인 차트를 처음 그릴 때 한 번만 import)
+@st.cache_resource
+def load_plotly_express():
+    """plotly.express 모듈 반환"""
+    import plotly.express as px
+    return px
+
+# 포트폴리오 JSON 파싱 (입력 문자열이 같으면 재실행 시 다시 파싱하지 않음)
+@st.cache_data(max_entries=8, show_spinner=False)
+def parse_portfolio_json(portfolio_json: str) -> dict:
+    """포트폴리오 JSON 문자열 파싱"""
+    return json.loads(portfolio_json)
+
 # 전역 어드바이저 인스턴스
 @st.cache_resource
 def get_advisor():
-    """캐시된 어드바이저 인스턴스 반환"""
-    advisor = DirectFinanceAdvisor()
-    advisor.initialize()
-    return advisor
+    """캐시된 어드바이저 인스턴스 반환 (초기화는 첫 상담 요청 시 수행)"""
+    return DirectFinanceAdvisor()
 
 def main():
     """메인 애플리케이션"""
@@ -421,28 +499,31 @@ def main():
         # 카테고리 선택
         category = st.selectbox(
             "상담 카테고리",
-            ["general", "budget", "investment", "tax", "retirement"],
-            format_func=lambda x: {
-                "general": "일반 상담",
-                "budget": "예산 관리",
-                "investment": "투자 상담",
-                "tax": "세무 상담",
-                "retirement": "퇴직 계획"
-            }[x]
+            list(CATEGORY_LABELS),
+            format_func=CATEGORY_LABELS.get
         )
         
         # 시스템 상태 확인
         advisor = get_advisor()
         if advisor.is_initialized:
             st.success("✅ 시스템 준비 완료")
-        else:
-            st.error("❌ 시스템 초기화 필요")
+            # 초기화된 시스템도 지식베이스와 에이전트를 새로 구성할 수 있도록 재초기화 버튼 제공
             if st.button("🔄 시스템 재초기화"):
+                advisor.initialize(force=True)
+                st.rerun()
+        elif advisor.init_failed:
+            st.error("❌ 시스템 초기화 실패")
+            if st.button("🔄 다시 초기화"):
+                advisor.initialize()
+                st.rerun()
+        else:
+            st.info("💡 시스템은 첫 상담 요청 시 초기화됩니다.")
+            if st.button("🔄 지금 초기화"):
                 advisor.initialize()
                 st.rerun()
     
     # 메인 컨텐츠
-    tab1, tab2, tab3, tab4 = st.tabs(["💬 재무 상담", "📊 포트폴리오 분석", "📈 시장 데이터", "📋 사용법"])
+    tab1, tab2, tab3, tab4 = st.tabs(TAB_NAMES)
     
     with tab1:
         st.header("💬 AI 재무 상담")
@@ -489,36 +570,23 @@ def main():
     with tab2:
         st.header("📊 포트폴리오 분석")
         
-        # 샘플 포트폴리오 데이터
-        sample_portfolio = {
-            "stocks": [
-                {"symbol": "AAPL", "shares": 10, "avg_price": 150},
-                {"symbol": "GOOGL", "shares": 5, "avg_price": 2800},
-                {"symbol": "MSFT", "shares": 8, "avg_price": 300}
-            ],
-            "bonds": [
-                {"name": "국채 10년", "amount": 10000000, "yield": 0.03}
-            ],
-            "cash": 5000000
-        }
-        
         # JSON 에디터 대신 텍스트 영역 사용 (하위 버전 호환성)
         st.subheader("📋 포트폴리오 데이터 입력")
         st.info("아래 JSON 데이터를 수정하여 포트폴리오를 구성하세요.")
         
         portfolio_json = st.text_area(
             "포트폴리오 데이터 (JSON 형식)",
-            value=json.dumps(sample_portfolio, indent=2, ensure_ascii=False),
+            value=SAMPLE_PORTFOLIO_JSON,
             height=300,
             help="JSON 형식으로 포트폴리오 데이터를 입력하세요."
         )
         
         try:
-            portfolio_data = json.loads(portfolio_json)
+            portfolio_data = parse_portfolio_json(portfolio_json)
         except json.JSONDecodeError as e:
             st.error(f"❌ JSON 형식 오류: {e}")
             st.info("기본 샘플 데이터를 사용합니다.")
-            portfolio_data = sample_portfolio
+            portfolio_data = SAMPLE_PORTFOLIO
         
         if st.button("📊 포트폴리오 분석", type="primary"):
             with st.spinner("포트폴리오를 분석하고 있습니다..."):
@@ -553,8 +621,8 @@ def main():
                         # 추천사항
                         if result.get('recommendations'):
                             st.subheader("💡 추천사항")
-                            for rec in result['recommendations']:
-                                st.info(rec)
+                            # 추천사항을 하나의 info 블록으로 표시 (항목마다 요소를 만들지 않음)
+                            st.info("\n".join(f"- {rec}" for rec in result['recommendations']))
                     else:
                         # 전체 기능 모드 결과 표시
                         st.json(result["analysis"])
@@ -593,8 +661,7 @@ def main():
                             
                             # 차트 표시
                             if PLOTLY_AVAILABLE:
-                                df = pd.DataFrame(data["data"])
-                                fig = px.line(df, x="date", y="close", title=f"{symbol} 주가 추이 (모의 데이터)")
+                                fig = load_plotly_express().line(data["data"], x="date", y="close", title=f"{symbol} 주가 추이 (모의 데이터)")
                                 st.plotly_chart(fig)
                         else:
                             # 전체 기능 모드 결과 표시
@@ -602,12 +669,16 @@ def main():
                                 # 간단한 차트 표시
                                 df = pd.DataFrame(result["data"]["data"])
                                 if not df.empty:
-                                    fig = px.line(df, x="date", y="close", title=f"{symbol} 주가 추이")
+                                    fig = load_plotly_express().line(df, x="date", y="close", title=f"{symbol} 주가 추이")
                                     st.plotly_chart(fig)
                         
-                        # 상세 데이터
+                        # 상세 데이터 (모의 시세 표는 JSON 대신 st.dataframe으로 전송)
                         with st.expander("📋 상세 데이터"):
-                            st.json(data)
+                            if isinstance(data.get("data"), pd.DataFrame):
+                                st.json({key: value for key, value in data.items() if key != "data"})
+                                st.dataframe(data["data"], hide_index=True)
+                            else:
+                                st.json(data)
     
     with tab4:
         st.header("📋 사용법")
@@ -6,6 +6,7 @@ API 호출 없이 내장 함수만으로 동작하는 최소 버전
 
 import streamlit as st
 import json
+import re
 import logging
 from datetime import datetime
 import time
@@ -25,7 +26,6 @@ st.set_page_config(
 # plotly import를 안전하게 처리
 try:
     import plotly.graph_objects as go
-    import plotly.express as px
     PLOTLY_AVAILABLE = True
 except ImportError:
     PLOTLY_AVAILABLE = False
@@ -48,6 +48,68 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 맞춤 조언 키워드 (서로 겹치지 않으므로 findall 한 번으로 모두 찾을 수 있음)
+ADVICE_KEYWORD_RE = re.compile("월급|연봉|투자|주식|부동산|저축|적금|대출|빚|500|300")
+
+# 상담 카테고리 선택지와 탭 이름
+CATEGORY_LABELS = {
+    "general": "일반 상담",
+    "budget": "예산 관리",
+    "investment": "투자 상담",
+    "tax": "세무 상담",
+    "retirement": "퇴직 계획"
+}
+TAB_NAMES = ("💬 재무 상담", "📊 포트폴리오 분석", "📈 시장 데이터", "📋 사용법")
+
+# 카테고리별 간단 모드 기본 응답
+SIMPLE_ADVICE_RESPONSES = {
+    "budget": {
+        "title": "💰 예산 관리 조언",
+        "advice": [
+            "1. 수입의 50-30-20 법칙을 따르세요 (필수지출 50%, 선택지출 30%, 저축 20%)",
+            "2. 모든 지출을 기록하고 분류하세요",
+            "3. 월별 예산을 세우고 정기적으로 검토하세요",
+            "4. 비상금을 3-6개월 생활비만큼 확보하세요"
+        ]
+    },
+    "investment": {
+        "title": "📈 투자 조언",
+        "advice": [
+            "1. 분산 투자로 리스크를 줄이세요",
+            "2. 장기 투자 관점을 유지하세요",
+            "3. 정기적인 포트폴리오 리밸런싱을 하세요",
+            "4. 투자 원금의 10% 이상을 한 번에 투자하지 마세요"
+        ]
+    },
+    "tax": {
+        "title": "🧾 세무 조언",
+        "advice": [
+            "1. 연말정산 시 필요한 서류를 미리 준비하세요",
+            "2. 세금공제 혜택을 최대한 활용하세요",
+            "3. 투자 관련 세금 혜택을 확인하세요",
+            "4. 전문가와 상담하여 세무 계획을 수립하세요"
+        ]
+    },
+    "retirement": {
+        "title": "🏠 퇴직 계획 조언",
+        "advice": [
+            "1. 퇴직 후 필요 생활비를 계산하세요",
+            "2. 연금 상품을 조기에 가입하세요",
+            "3. 부동산 투자도 고려해보세요",
+            "4. 정기적으로 퇴직 계획을 점검하세요"
+        ]
+    },
+    "general": {
+        "title": "💡 일반 재무 조언",
+        "advice": [
+            "1. 수입과 지출을 정확히 파악하세요",
+            "2. 목표를 세우고 단계별로 실행하세요",
+            "3. 정기적으로 재무 상태를 점검하세요",
+            "4. 전문가 상담을 받아보세요"
+        ]
+    }
+}
+
 class SimpleFinanceAdvisor:
     """API 호출 없이 내장 함수만으로 동작하는 간단한 재무 관리 어드바이저"""
     
@@ -57,94 +119,35 @@ class SimpleFinanceAdvisor:
     def get_financial_advice(self, user_input: str, category: str = "general") -> dict:
         """재무 상담 제공 (내장 로직)"""
         try:
-            # 카테고리별 기본 응답
-            responses = {
-                "budget": {
-                    "title": "💰 예산 관리 조언",
-                    "advice": [
-                        "1. 수입의 50-30-20 법칙을 따르세요 (필수지출 50%, 선택지출 30%, 저축 20%)",
-                        "2. 모든 지출을 기록하고 분류하세요",
-                        "3. 월별 예산을 세우고 정기적으로 검토하세요",
-                        "4. 비상금을 3-6개월 생활비만큼 확보하세요"
-                    ]
-                },
-                "investment": {
-                    "title": "📈 투자 조언",
-                    "advice": [
-                        "1. 분산 투자로 리스크를 줄이세요",
-                        "2. 장기 투자 관점을 유지하세요",
-                        "3. 정기적인 포트폴리오 리밸런싱을 하세요",
-                        "4. 투자 원금의 10% 이상을 한 번에 투자하지 마세요"
-                    ]
-                },
-                "tax": {
-                    "title": "🧾 세무 조언",
-                    "advice": [
-                        "1. 연말정산 시 필요한 서류를 미리 준비하세요",
-                        "2. 세금공제 혜택을 최대한 활용하세요",
-                        "3. 투자 관련 세금 혜택을 확인하세요",
-                        "4. 전문가와 상담하여 세무 계획을 수립하세요"
-                    ]
-                },
-                "retirement": {
-                    "title": "🏠 퇴직 계획 조언",
-                    "advice": [
-                        "1. 퇴직 후 필요 생활비를 계산하세요",
-                        "2. 연금 상품을 조기에 가입하세요",
-                        "3. 부동산 투자도 고려해보세요",
-                        "4. 정기적으로 퇴직 계획을 점검하세요"
-                    ]
-                },
-                "general": {
-                    "title": "💡 일반 재무 조언",
-                    "advice": [
-                        "1. 수입과 지출을 정확히 파악하세요",
-                        "2. 목표를 세우고 단계별로 실행하세요",
-                        "3. 정기적으로 재무 상태를 점검하세요",
-                        "4. 전문가 상담을 받아보세요"
-                    ]
-                }
-            }
-            
-            selected = responses.get(category, responses["general"])
+            # 같은 질문은 캐시된 응답을 재사용하고 요청 시각만 새로 기록
+            return {**generate_simple_advice(user_input, category), "timestamp": datetime.now().isoformat()}
             
-            # 사용자 입력에 따른 맞춤 조언 추가
-            custom_advice = self._generate_custom_advice(user_input, category)
-            
-            return {
-                "success": True,
-                "title": selected["title"],
-                "general_advice": selected["advice"],
-                "custom_advice": custom_advice,
-                "category": category,
-                "timestamp": datetime.now().isoformat()
-            }
-                
         except Exception as e:
             logger.error(f"상담 처리 오류: {e}")
             return {"error": f"상담 처리 중 오류 발생: {str(e)}"}
     
-    def _generate_custom_advice(self, user_input: str, category: str) -> str:
+    @staticmethod
+    def _generate_custom_advice(user_input: str, category: str) -> str:
         """사용자 입력에 따른 맞춤 조언 생성"""
-        input_lower = user_input.lower()
+        # 키워드 기반 맞춤 조언 (입력을 한 번만 스캔해 포함된 키워드 집합 생성)
+        keywords = set(ADVICE_KEYWORD_RE.findall(user_input.lower()))
         
-        # 키워드 기반 맞춤 조언
-        if "월급" in input_lower or "연봉" in input_lower:
-            if "500" in input_lower or "500만" in input_lower:
+        if "월급" in keywords or "연봉" in keywords:
+            if "500" in keywords:
                 return "월급 500만원 기준으로는 생활비 250만원, 여유자금 150만원, 저축 100만원으로 나누어 관리하는 것을 권장합니다."
-            elif "300" in input_lower or "300만" in input_lower:
+            elif "300" in keywords:
                 return "월급 300만원 기준으로는 생활비 180만원, 여유자금 60만원, 저축 60만원으로 관리하세요."
         
-        if "투자" in input_lower:
-            if "주식" in input_lower:
+        if "투자" in keywords:
+            if "주식" in keywords:
                 return "주식 투자는 장기 관점으로 접근하고, 분산 투자를 통해 리스크를 관리하세요."
-            elif "부동산" in input_lower:
+            elif "부동산" in keywords:
                 return "부동산 투자는 위치와 수익성을 중점적으로 고려하고, 정부 정책 변화에 주의하세요."
         
-        if "저축" in input_lower or "적금" in input_lower:
+        if "저축" in keywords or "적금" in keywords:
             return "정기적금이나 자동이체를 활용하여 꾸준한 저축 습관을 만드세요."
         
-        if "대출" in input_lower or "빚" in input_lower:
+        if "대출" in keywords or "빚" in keywords:
             return "대출은 최소한으로 유지하고, 고금리 대출부터 우선적으로 상환하세요."
         
         return "구체적인 상황에 맞는 상세한 상담을 위해 전문가와 상담하시는 것을 권장합니다."
@@ -153,19 +156,16 @@ class SimpleFinanceAdvisor:
         """포트폴리오 분석 (내장 로직)"""
         try:
             # 간단한 포트폴리오 분석
-            total_value = 0
-            stock_value = 0
-            bond_value = 0
             cash_value = portfolio_data.get("cash", 0)
             
-            # 주식 가치 계산
-            for stock in portfolio_data.get("stocks", []):
-                current_price = stock.get("avg_price", 0) * 1.1  # 10% 상승 가정
-                stock_value += current_price * stock.get("shares", 0)
+            # 주식 가치 계산 (평균 매입가 대비 10% 상승 가정, 배열 연산으로 합산)
+            stocks = portfolio_data.get("stocks", [])
+            avg_prices = np.fromiter((stock.get("avg_price", 0) for stock in stocks), dtype=np.float64, count=len(stocks))
+            shares = np.fromiter((stock.get("shares", 0) for stock in stocks), dtype=np.float64, count=len(stocks))
+            stock_value = float(avg_prices.dot(shares) * 1.1)
             
             # 채권 가치 계산
-            for bond in portfolio_data.get("bonds", []):
-                bond_value += bond.get("amount", 0)
+            bond_value = sum(bond.get("amount", 0) for bond in portfolio_data.get("bonds", []))
             
             total_value = stock_value + bond_value + cash_value
             
@@ -204,42 +204,8 @@ class SimpleFinanceAdvisor:
     def get_market_data(self, symbol: str) -> dict:
         """시장 데이터 조회 (모의 데이터)"""
         try:
-            # 모의 주가 데이터 생성
-            import random
-            base_price = 100 + random.randint(-50, 100)
-            
-            # 30일간의 모의 데이터
-            dates = pd.date_range(start=datetime.now() - pd.Timedelta(days=30), periods=30, freq='D')
-            prices = []
-            
-            for i in range(30):
-                change = random.uniform(-0.05, 0.05)  # ±5% 변동
-                if i == 0:
-                    price = base_price
-                else:
-                    price = prices[-1] * (1 + change)
-                prices.append(round(price, 2))
-            
-            # 거래량 데이터
-            volumes = [random.randint(1000000, 5000000) for _ in range(30)]
-            
-            data = {
-                "symbol": symbol,
-                "current_price": prices[-1],
-                "change": round(prices[-1] - prices[-2], 2) if len(prices) > 1 else 0,
-                "change_percent": round(((prices[-1] - prices[-2]) / prices[-2] * 100), 2) if len(prices) > 1 else 0,
-                "data": [
-                    {
-                        "date": date.strftime("%Y-%m-%d"),
-                        "open": price,
-                        "high": price * 1.02,
-                        "low": price * 0.98,
-                        "close": price,
-                        "volume": volume
-                    }
-                    for date, price, volume in zip(dates, prices, volumes)
-                ]
-            }
+            # 모의 주가 데이터 생성 (심볼별 캐시)
+            data = generate_mock_market_data(symbol)
             
             return {
                 "success": True,
@@ -252,11 +218,62 @@ class SimpleFinanceAdvisor:
             logger.error(f"시장 데이터 조회 오류: {e}")
             return {"error": f"시장 데이터 조회 중 오류 발생: {str(e)}"}
 
-# 전역 어드바이저 인스턴스
+# 간단 모드 상담 응답 (시각을 제외하면 질문과 카테고리로 결정되므로 캐시)
+@st.cache_data(ttl=3600, max_entries=512, show_spinner=False)
+def generate_simple_advice(user_input: str, category: str) -> dict:
+    """카테고리 기본 조언과 맞춤 조언으로 상담 응답 생성"""
+    selected = SIMPLE_ADVICE_RESPONSES.get(category, SIMPLE_ADVICE_RESPONSES["general"])
+    
+    return {
+        "success": True,
+        "title": selected["title"],
+        "general_advice": selected["advice"],
+        "custom_advice": SimpleFinanceAdvisor._generate_custom_advice(user_input, category),
+        "category": category
+    }
+
+# 모의 시장 데이터 (같은 심볼은 60초 동안 캐시)
+@st.cache_data(ttl=60, show_spinner=False)
+def generate_mock_market_data(symbol: str) -> dict:
+    """30일간의 모의 주가 데이터 생성 (NumPy 벡터 연산, 시세는 DataFrame 그대로 반환)"""
+    rng = np.random.default_rng()
+    base_price = 100 + int(rng.integers(-50, 101))
+    
+    # 첫날은 기준가, 이후 ±5% 일간 변동을 누적
+    changes = rng.uniform(-0.05, 0.05, 30)
+    changes[0] = 0.0
+    prices = np.round(base_price * np.cumprod(1 + changes), 2)
+    
+    # 거래량 데이터
+    volumes = rng.integers(1000000, 5000001, 30)
+    
+    dates = pd.date_range(start=datetime.now() - pd.Timedelta(days=30), periods=30, freq='D')
+    history = pd.DataFrame({
+        "date": dates.strftime("%Y-%m-%d"),
+        "open": prices,
+        "high": prices * 1.02,
+        "low": prices * 0.98,
+        "close": prices,
+        "volume": volumes
+    })
+    
+    return {
+        "symbol": symbol,
+        "current_price": float(prices[-1]),
+        "change": round(float(prices[-1] - prices[-2]), 2),
+        "change_percent": round(float((prices[-1] - prices[-2]) / prices[-2] * 100), 2),
+        "data": history
+    }
+
+# plotly.express 지연 로딩 (라인 차트를 처음 그릴 때 한 번만 import)
 @st.cache_resource
-def get_advisor():
-    """캐시된 어드바이저 인스턴스 반환"""
-    return SimpleFinanceAdvisor()
+def load_plotly_express():
+    """plotly.express 모듈 반환"""
+    import plotly.express as px
+    return px
+
+# 전역 어드바이저 인스턴스 (상태가 없으므로 캐시 조회 없이 모듈에서 바로 생성)
+ADVISOR = SimpleFinanceAdvisor()
 
 def main():
     """메인 애플리케이션"""
@@ -270,23 +287,17 @@ def main():
         # 카테고리 선택
         category = st.selectbox(
             "상담 카테고리",
-            ["general", "budget", "investment", "tax", "retirement"],
-            format_func=lambda x: {
-                "general": "일반 상담",
-                "budget": "예산 관리",
-                "investment": "투자 상담",
-                "tax": "세무 상담",
-                "retirement": "퇴직 계획"
-            }[x]
+            list(CATEGORY_LABELS),
+            format_func=CATEGORY_LABELS.get
         )
         
         st.success("✅ 시스템 준비 완료")
         st.info("💡 이 버전은 API 서버 없이 내장 로직으로 동작합니다.")
     
     # 메인 컨텐츠
-    tab1, tab2, tab3, tab4 = st.tabs(["💬 재무 상담", "📊 포트폴리오 분석", "📈 시장 데이터", "📋 사용법"])
+    tab1, tab2, tab3, tab4 = st.tabs(TAB_NAMES)
     
-    advisor = get_advisor()
+    advisor = ADVISOR
     
     with tab1:
         st.header("💬 AI 재무 상담")
@@ -379,8 +390,8 @@ def main():
                     # 추천사항
                     if result.get('recommendations'):
                         st.subheader("💡 추천사항")
-                        for rec in result['recommendations']:
-                            st.info(rec)
+                        # 추천사항을 하나의 info 블록으로 표시 (항목마다 요소를 만들지 않음)
+                        st.info("\n".join(f"- {rec}" for rec in result['recommendations']))
                     
                     # 상세 정보
                     with st.expander("📋 상세 분석 정보"):
@@ -418,13 +429,13 @@ def main():
                         
                         # 차트 표시
                         if PLOTLY_AVAILABLE:
-                            df = pd.DataFrame(data["data"])
-                            fig = px.line(df, x="date", y="close", title=f"{symbol} 주가 추이 (모의 데이터)")
+                            fig = load_plotly_express().line(data["data"], x="date", y="close", title=f"{symbol} 주가 추이 (모의 데이터)")
                             st.plotly_chart(fig)
                         
-                        # 상세 데이터
+                        # 상세 데이터 (시세 표는 JSON 대신 st.dataframe으로 전송)
                         with st.expander("📋 상세 데이터"):
-                            st.json(data)
+                            st.json({key: value for key, value in data.items() if key != "data"})
+                            st.dataframe(data["data"], hide_index=True)
     
     with tab4:
         st.header("📋 사용법")
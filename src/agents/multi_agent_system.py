@@ -6,7 +6,7 @@ LangChain과 LangGraph를 활용한 재무관리 전문 에이전트들
 import os
 import logging
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator
 from datetime import datetime
 
 from langchain_community.chat_models import AzureChatOpenAI
@@ -214,13 +214,11 @@ class MultiAgentSystem:
                 return {"error": "에이전트가 초기화되지 않았습니다."}
             
             # 빠른 응답을 위한 간단한 모드 (긴 질문이 아닌 경우)
-            if len(query) < 50 and not any(word in query.lower() for word in ["종합", "전체", "모든", "상세"]):
+            if self._is_simple_query(query):
                 return self._fast_response(query, user_data)
             
             # RAG를 통한 관련 컨텍스트 검색 (간단한 질문은 스킵)
-            context = ""
-            if len(query) > 30:
-                context = self.knowledge_base.get_relevant_context(query) if self.knowledge_base else ""
+            context = self._get_context(query)
             
             # 쿼리 분석하여 적절한 에이전트 선택
             agent_type = self._classify_query(query)
@@ -228,19 +226,9 @@ class MultiAgentSystem:
             if agent_type in self.agents:
                 # 특정 에이전트로 처리 (빠른 모드)
                 try:
-                    # 에이전트 정보 가져오기
-                    agent_info = self.agents[agent_type]
-                    
-                    # 간단한 프롬프트 구성
-                    system_prompt = f"{agent_info['prompt']}\n\n답변은 3-4문장으로 간결하게 제공하세요."
-                    combined_input = f"질문: {query}"
-                    if user_data and len(str(user_data)) < 200:
-                        user_info = f"\n사용자 정보: {user_data}"
-                        combined_input += user_info
-                    
                     # LLM 직접 호출
-                    full_prompt = f"{system_prompt}\n\n{combined_input}"
-                    result = agent_info["llm"].invoke(full_prompt)
+                    full_prompt = self._build_agent_prompt(agent_type, query, user_data)
+                    result = self.agents[agent_type]["llm"].invoke(full_prompt)
                     
                     return {
                         "answer": result.content,
@@ -263,15 +251,7 @@ class MultiAgentSystem:
         """빠른 응답 (간단한 질문용)"""
         try:
             # 간단한 프롬프트로 빠른 응답
-            fast_prompt = f"""당신은 재무관리 전문가입니다. 
-사용자의 질문에 대해 2-3문장으로 간결하고 실용적인 답변을 제공하세요.
-
-질문: {query}"""
-
-            if user_data and len(str(user_data)) < 100:
-                fast_prompt += f"\n\n사용자 정보: {user_data}"
-
-            result = self.llm.invoke(fast_prompt)
+            result = self.llm.invoke(self._build_fast_prompt(query, user_data))
             
             return {
                 "answer": result.content,
@@ -283,6 +263,80 @@ class MultiAgentSystem:
             logger.error(f"[ERROR] 빠른 응답 실패: {e}")
             return {"error": "빠른 응답 처리 중 오류가 발생했습니다."}
     
+    def stream_query(self, query: str, user_data: Dict[str, Any] = None) -> Iterator[Dict[str, Any]]:
+        """사용자 쿼리 스트리밍 처리
+        
+        단일 LLM 호출로 답하는 질문은 생성되는 토큰을 {"delta": ...}로 바로 반환하고,
+        여러 에이전트를 거치는 질문은 완성된 답변을 한 번에 반환합니다.
+        마지막에는 agent_type, context_used를 담은 이벤트(실패 시 {"error": ...})를 반환합니다.
+        """
+        if not self.is_initialized or not self.agents:
+            yield {"error": "시스템이 초기화되지 않았습니다."}
+            return
+        
+        try:
+            if self._is_simple_query(query):
+                llm = self.llm
+                prompt = self._build_fast_prompt(query, user_data)
+                meta = {"agent_type": "fast", "context_used": False}
+            else:
+                context = self._get_context(query)
+                agent_type = self._classify_query(query)
+                
+                if agent_type not in self.agents:
+                    # 여러 에이전트 결과를 합치는 경우 토큰 스트리밍 없이 한 번에 반환
+                    result = self._simple_comprehensive_response(query, user_data, context)
+                    if "error" in result:
+                        yield {"error": result["error"]}
+                        return
+                    yield {"delta": result["answer"]}
+                    yield {"agent_type": result["agent_type"], "context_used": result["context_used"]}
+                    return
+                
+                llm = self.agents[agent_type]["llm"]
+                prompt = self._build_agent_prompt(agent_type, query, user_data)
+                meta = {"agent_type": agent_type, "context_used": bool(context)}
+            
+            for chunk in llm.stream(prompt):
+                if chunk.content:
+                    yield {"delta": chunk.content}
+        except Exception as e:
+            # 검색/분류 단계 실패도 SSE 헤더 전송 후이므로 error 이벤트로 알림
+            logger.error(f"[ERROR] 스트리밍 응답 실패: {e}")
+            yield {"error": f"처리 중 오류가 발생했습니다: {str(e)}"}
+            return
+        
+        yield meta
+    
+    def _is_simple_query(self, query: str) -> bool:
+        """빠른 응답 모드로 처리할 간단한 질문인지 확인"""
+        return len(query) < 50 and not any(word in query.lower() for word in ["종합", "전체", "모든", "상세"])
+    
+    def _get_context(self, query: str) -> str:
+        """RAG를 통한 관련 컨텍스트 검색 (간단한 질문은 스킵)"""
+        if len(query) > 30 and self.knowledge_base:
+            return self.knowledge_base.get_relevant_context(query)
+        return ""
+    
+    def _build_fast_prompt(self, query: str, user_data: Dict[str, Any] = None) -> str:
+        """빠른 응답용 프롬프트 구성"""
+        fast_prompt = f"""당신은 재무관리 전문가입니다. 
+사용자의 질문에 대해 2-3문장으로 간결하고 실용적인 답변을 제공하세요.
+
+질문: {query}"""
+
+        if user_data and len(str(user_data)) < 100:
+            fast_prompt += f"\n\n사용자 정보: {user_data}"
+        return fast_prompt
+    
+    def _build_agent_prompt(self, agent_type: str, query: str, user_data: Dict[str, Any] = None) -> str:
+        """특정 에이전트용 간단한 프롬프트 구성"""
+        system_prompt = f"{self.agents[agent_type]['prompt']}\n\n답변은 3-4문장으로 간결하게 제공하세요."
+        combined_input = f"질문: {query}"
+        if user_data and len(str(user_data)) < 200:
+            combined_input += f"\n사용자 정보: {user_data}"
+        return f"{system_prompt}\n\n{combined_input}"
+    
     def _simple_comprehensive_response(self, query: str, user_data: Dict[str, Any] = None, context: str = "") -> Dict[str, Any]:
         """간단한 종합 응답 (모든 에이전트 실행하지 않음)"""
         try:
@@ -3,6 +3,7 @@ FastAPI 메인 애플리케이션
 AI 재무관리 어드바이저의 REST API 서버 (RAG + Multi Agent 통합)
 """
 
+import json
 import logging
 import time
 import asyncio
@@ -11,7 +12,8 @@ from datetime import datetime
 
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
@@ -105,6 +107,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 긴 응답(분석 결과 마크다운 등) gzip 압축
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # 중복된 라우터 제거 - 메인 API만 사용
 
 # 전역 변수
@@ -318,11 +323,23 @@ async def process_query(
         user_data = request.user_data.dict() if request.user_data else {}
         response = agent_system.process_query(request.query, user_data)
         
+        # 에이전트 응답(dict)을 풀어서 반환 (클라이언트의 문자열 재파싱 방지)
+        if not isinstance(response, dict):
+            response = {"answer": response}
+        
+        # 에이전트 실패는 답변이 아닌 error 필드로 전달
+        if "answer" not in response:
+            return {
+                "query": request.query,
+                "error": response.get("error", "답변을 생성할 수 없습니다."),
+                "timestamp": datetime.now().isoformat()
+            }
+        
         return {
             "query": request.query,
-            "answer": response,
-            "agent_type": "comprehensive",
-            "context_used": True,
+            "answer": response["answer"],
+            "agent_type": response.get("agent_type"),
+            "context_used": response.get("context_used", False),
             "timestamp": datetime.now().isoformat()
         }
         
@@ -346,6 +363,37 @@ async def process_query(
             detail=f"쿼리 처리 중 오류가 발생했습니다: {str(e)}"
         )
 
+@app.post("/query/stream")
+async def stream_query(
+    request: QueryRequest,
+    agent_system: MultiAgentSystem = Depends(get_multi_agent_system)
+):
+    """
+    사용자 쿼리 스트리밍 처리 (Server-Sent Events)
+    
+    답변 조각은 data: {"delta": ...} 이벤트로 생성되는 대로 전송하고,
+    마지막 이벤트에는 agent_type, context_used(실패 시 error)를 담습니다.
+    """
+    try:
+        kb = await get_knowledge_base()
+        if agent_system.knowledge_base is None:
+            logger.info("멀티 에이전트 시스템에 지식베이스 연결 중...")
+            agent_system.knowledge_base = kb
+    except Exception as e:
+        logger.error(f"스트리밍 쿼리 준비 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"쿼리 처리 중 오류가 발생했습니다: {str(e)}"
+        )
+    
+    user_data = request.user_data.dict() if request.user_data else {}
+    
+    def event_stream():
+        for event in agent_system.stream_query(request.query, user_data):
+            yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 @app.post("/analyze/{analysis_type}", response_model=Dict[str, Any])
 async def analyze_financial_data(
     analysis_type: str,
@@ -670,6 +718,39 @@ async def predict_market_trend(
             detail=f"시장 예측 중 오류가 발생했습니다: {str(e)}"
         )
 
+@app.post("/ai/analyze")
+async def analyze_symbol(request: Dict[str, Any]):
+    """종목 통합 분석 (감정 분석과 시장 예측을 한 번의 요청으로 처리)"""
+    symbol = request.get("symbol", "")
+    if not symbol:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="분석할 종목 코드가 필요합니다."
+        )
+    
+    kinds = request.get("kinds", ["sentiment", "prediction"])
+    result = {"symbol": symbol}
+    
+    # 분석별 실패는 다른 분석 결과를 버리지 않도록 해당 항목의 error로 전달
+    if "sentiment" in kinds:
+        try:
+            result["sentiment"] = advanced_ai.analyze_market_sentiment([f"분석 대상: {symbol}"])
+        except Exception as e:
+            logger.error(f"감정 분석 실패: {e}")
+            result["sentiment"] = {"error": f"감정 분석 중 오류가 발생했습니다: {str(e)}"}
+    if "prediction" in kinds:
+        try:
+            result["prediction"] = advanced_ai.predict_market_trend(
+                symbol,
+                request.get("days", 30),
+                request.get("confidence_level", 0.8)
+            )
+        except Exception as e:
+            logger.error(f"시장 예측 실패: {e}")
+            result["prediction"] = {"error": f"시장 예측 중 오류가 발생했습니다: {str(e)}"}
+    
+    return result
+
 # 예외 처리
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):